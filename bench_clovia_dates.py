@@ -0,0 +1,105 @@
+"""Microbenchmark for Clovia review date parsing.
+
+Generates synthetic review dates (mostly the API's "YYYY-MM-DD HH:MM:SS", plus a fraction of
+the other formats parse_review_date accepts) and times:
+
+    baseline  the original strptime/regex parser, uncached, one string at a time
+    scalar    CloviaScraper.parse_review_date (fast path + LRU memo), one string at a time
+    bulk      CloviaScraper.parse_review_dates in BULK_PARSE_BATCH chunks, as the scraper does
+
+Every method's year/month counts are checked against the baseline.
+
+    python bench_clovia_dates.py --n 1000000 --odd-fraction 0.02
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import clovia
+
+ODD_FORMATS = ["%Y-%m-%d", "%b %d, %Y", "%d %b %Y", "%B %d, %Y", "%d-%m-%Y", "%d/%m/%Y"]
+
+
+def make_dates(n, odd_fraction, distinct, seed):
+    """n date strings drawn from `distinct` unique timestamps over 2019-2026"""
+    rnd = random.Random(seed)
+    start = datetime(2019, 1, 1)
+    span_s = 8 * 365 * 86400
+    pool = [start + timedelta(seconds=rnd.randrange(span_s)) for _ in range(distinct)]
+    out = []
+    for _ in range(n):
+        d = rnd.choice(pool)
+        if rnd.random() < odd_fraction:
+            out.append(d.strftime(rnd.choice(ODD_FORMATS)))
+        else:
+            out.append(d.strftime(clovia.API_DATE_FORMAT))
+    return out
+
+
+def tally_scalar(dates, parse):
+    tally = clovia.ReviewTally()
+    for date_str in dates:
+        parsed_date = parse(date_str)
+        if parsed_date:
+            tally.add(parsed_date)
+    return tally
+
+
+def tally_bulk(dates, scraper):
+    tally = clovia.ReviewTally()
+    for i in range(0, len(dates), clovia.BULK_PARSE_BATCH):
+        tally.add_many(scraper.parse_review_dates(dates[i:i + clovia.BULK_PARSE_BATCH]))
+    return tally
+
+
+def counts(tally):
+    return dict(tally.year_counts), dict(tally.month_counts)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark Clovia review date parsing")
+    p.add_argument("--n", type=int, default=1_000_000, help="Number of dates to parse")
+    p.add_argument("--odd-fraction", type=float, default=0.02, help="Fraction of dates not in the API format")
+    p.add_argument("--distinct", type=int, default=0, help="Distinct timestamps to draw from (default: n, i.e. few repeats)")
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--skip-baseline", action="store_true", help="Skip the slow original parser")
+    args = p.parse_args()
+
+    dates = make_dates(args.n, args.odd_fraction, args.distinct or args.n, args.seed)
+    scraper = clovia.CloviaScraper(state_path=None)
+    print(f"{args.n:,} dates, {args.odd_fraction:.1%} in other formats, {len(set(dates)):,} distinct strings")
+
+    results = {}
+    if not args.skip_baseline:
+        t = time.perf_counter()
+        results["baseline"] = counts(tally_scalar(dates, clovia.parse_date_string.__wrapped__))
+        baseline_s = time.perf_counter() - t
+        print(f"  baseline  {baseline_s:8.2f}s  {args.n / baseline_s:12,.0f} dates/s")
+    else:
+        baseline_s = None
+
+    runs = [
+        ("scalar", lambda: tally_scalar(dates, scraper.parse_review_date)),
+        ("bulk", lambda: tally_bulk(dates, scraper)),
+    ]
+    for name, run in runs:
+        clovia.parse_date_string.cache_clear()
+        t = time.perf_counter()
+        results[name] = counts(run())
+        elapsed = time.perf_counter() - t
+        speedup = f"  {baseline_s / elapsed:5.1f}x" if baseline_s else ""
+        print(f"  {name:<8}  {elapsed:8.2f}s  {args.n / elapsed:12,.0f} dates/s{speedup}")
+
+    reference = results.get("baseline", results["scalar"])
+    for name, result in results.items():
+        if result != reference:
+            print(f"  MISMATCH: {name} counts differ from the reference")
+            return 1
+    print("  all methods agree on year/month counts")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
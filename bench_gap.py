@@ -0,0 +1,369 @@
+"""End-to-end throughput benchmark for gap.py against a local Gap/PowerReviews stand-in.
+
+The stand-in runs in a child process (so its allocations and GIL time do not count against
+gap.py) and serves synthetic listing pages for the ``/cc`` and ``/style`` product APIs, a PDP
+carrying a ``powerReviewsConfig`` blob, and PowerReviews review pages. Style ``i`` always has
+the same reviews for a given seed. ``build_rows`` is pointed at it by rewriting gap.py's URL
+constants and run once per (size, concurrency) pair:
+
+	python bench_gap.py --sizes 100,500,2000 --pr-concurrency 1,4,8 --latency-ms 20 --error-rate 0.02
+
+Each run reports rows/s, requests by endpoint, PowerReviews requests per row, injected 429s
+and (unless --no-memory) peak traced memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+import gap
+
+DAY_MS = 86_400_000
+
+
+@dataclass(frozen=True)
+class StandInConfig:
+	colors: int = 3
+	max_reviews: int = 600
+	history_years: int = 8
+	latency_ms: float = 0.0
+	error_rate: float = 0.0
+	retry_after_s: int = 0
+	cc_page_size: int = 100
+	seed: int = 1
+
+
+class _StandIn:
+	"""Synthetic catalogue: style ``i`` is derived from ``(seed, i)`` so every run sees the same data."""
+
+	def __init__(self, cfg: StandInConfig) -> None:
+		self.cfg = cfg
+		self.now_ms = int(time.time() * 1000)
+		self._reviews: Dict[int, List[int]] = {}
+		self._lock = threading.Lock()
+		self._rng = random.Random(cfg.seed)
+		self.counts: Dict[str, int] = {}
+
+	def bump(self, key: str) -> None:
+		with self._lock:
+			self.counts[key] = self.counts.get(key, 0) + 1
+
+	def inject_error(self) -> bool:
+		if self.cfg.error_rate <= 0:
+			return False
+		with self._lock:
+			return self._rng.random() < self.cfg.error_rate
+
+	def review_count(self, idx: int) -> int:
+		# Long-tailed like real catalogues: most styles have a handful, a few have hundreds.
+		rng = random.Random(self.cfg.seed * 1_000_003 + idx)
+		if rng.random() < 0.25:
+			return 0
+		return min(self.cfg.max_reviews, int(rng.paretovariate(1.2) * 5))
+
+	def reviews(self, idx: int) -> List[int]:
+		with self._lock:
+			cached = self._reviews.get(idx)
+		if cached is not None:
+			return cached
+		rng = random.Random(self.cfg.seed * 7_919 + idx)
+		span = self.cfg.history_years * 365 * DAY_MS
+		created = sorted((self.now_ms - rng.randrange(span) for _ in range(self.review_count(idx))), reverse=True)
+		with self._lock:
+			self._reviews[idx] = created
+		return created
+
+	def style(self, idx: int) -> Dict[str, Any]:
+		style_id = str(100000 + idx)
+		return {
+			"styleId": style_id,
+			"styleName": f"Bench Bra {idx}",
+			"reviewScore": 4.2,
+			"reviewCount": self.review_count(idx),
+			"styleColors": [
+				{
+					"ccId": f"{style_id}{c:02d}",
+					"ccName": f"Color {c}",
+					"effectivePrice": 19.99 + c,
+					"regularPrice": 29.99 + c,
+				}
+				for c in range(self.cfg.colors)
+			],
+		}
+
+	def listing(self, *, n_styles: int, page: int, per_color: bool, page_size: int) -> Dict[str, Any]:
+		if per_color:
+			# The style (search) API returns one item per color.
+			total = n_styles * self.cfg.colors
+			items = []
+			for i in range(page * page_size, min(total, (page + 1) * page_size)):
+				style = self.style(i // self.cfg.colors)
+				items.append({**style, "styleColors": [style["styleColors"][i % self.cfg.colors]]})
+		else:
+			total = n_styles
+			items = [self.style(i) for i in range(page * page_size, min(total, (page + 1) * page_size))]
+		return {
+			"products": items,
+			"pagination": {"pageNumberTotal": max(1, -(-total // page_size))},
+			"totalColors": n_styles * self.cfg.colors,
+		}
+
+	def review_page(self, idx: int, paging_from: int, paging_size: int) -> Dict[str, Any]:
+		created = self.reviews(idx)
+		page = created[paging_from:paging_from + paging_size]
+		return {
+			"paging": {"total_results": len(created), "current_page_number": paging_from // max(1, paging_size) + 1},
+			"results": [
+				{
+					"reviews": [
+						{"review_id": idx * 100_000 + k, "details": {"created_date": ts}}
+						for k, ts in enumerate(page, start=paging_from)
+					]
+				}
+			],
+		}
+
+
+def _make_handler(state: _StandIn) -> type:
+	class Handler(BaseHTTPRequestHandler):
+		protocol_version = "HTTP/1.1"
+
+		def log_message(self, *args: Any) -> None:
+			pass
+
+		def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+			self.send_response(status)
+			self.send_header("Content-Type", content_type)
+			self.send_header("Content-Length", str(len(body)))
+			for k, v in (headers or {}).items():
+				self.send_header(k, v)
+			self.end_headers()
+			self.wfile.write(body)
+
+		def _json(self, data: Any) -> None:
+			self._send(200, json.dumps(data).encode(), "application/json")
+
+		def do_GET(self) -> None:
+			url = urlparse(self.path)
+			q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+			if url.path == "/__stats":
+				self._json(state.counts)
+				return
+			if url.path == "/__reset":
+				state.counts.clear()
+				self._json({})
+				return
+
+			if state.cfg.latency_ms > 0:
+				time.sleep(state.cfg.latency_ms / 1000)
+			if state.inject_error():
+				state.bump("429")
+				self._send(429, b"slow down", "text/plain", {"Retry-After": str(state.cfg.retry_after_s)})
+				return
+
+			if url.path.startswith("/commerce/search/products/v2/"):
+				per_color = url.path.endswith("/style")
+				state.bump("listing")
+				# Sizes are addressed by cid (category runs) or by keyword "bench<N>" (search runs).
+				n_styles = int(q.get("cid") or q.get("keyword", "bench0")[len("bench"):] or 0)
+				page_size = int(q.get("pageSize") or state.cfg.cc_page_size)
+				self._json(state.listing(
+					n_styles=n_styles,
+					page=int(q.get("pageNumber", 0)),
+					per_color=per_color,
+					page_size=page_size,
+				))
+			elif url.path == "/browse/product.do":
+				state.bump("pdp")
+				blob = '{\\"powerReviewsConfig\\":{\\"merchantId\\":4242,\\"apiKey\\":\\"bench-key\\"}}'
+				html = "<html><head>" + "x" * 50_000 + f"<script>{blob}</script>" + "y" * 150_000 + "</head></html>"
+				self._send(200, html.encode(), "text/html; charset=utf-8")
+			elif "/product/" in url.path and url.path.endswith("/reviews"):
+				state.bump("powerreviews")
+				style_id = url.path.split("/product/")[1].split("/")[0]
+				self._json(state.review_page(
+					int(style_id) - 100000,
+					int(q.get("paging.from", 0)),
+					int(q.get("paging.size", 25)),
+				))
+			else:
+				self._send(404, b"not found", "text/plain")
+
+	return Handler
+
+
+class _QuietServer(ThreadingHTTPServer):
+	daemon_threads = True
+
+	def handle_error(self, request: Any, client_address: Any) -> None:
+		# Pooled client connections are dropped at the end of each run; that is not an error.
+		pass
+
+
+def _serve(cfg: StandInConfig, port_queue: Any) -> None:
+	server = _QuietServer(("127.0.0.1", 0), _make_handler(_StandIn(cfg)))
+	port_queue.put(server.server_address[1])
+	server.serve_forever()
+
+
+def start_stand_in(cfg: StandInConfig) -> Tuple[Any, str]:
+	"""Start the stand-in in a child process; return ``(process, base_url)``."""
+	ctx = multiprocessing.get_context("spawn")
+	port_queue = ctx.Queue()
+	proc = ctx.Process(target=_serve, args=(cfg, port_queue), daemon=True)
+	proc.start()
+	port = port_queue.get(timeout=30)
+	return proc, f"http://127.0.0.1:{port}"
+
+
+def point_gap_at(base_url: str) -> None:
+	gap.GAP_PRODUCTS_CC_API = f"{base_url}/commerce/search/products/v2/cc"
+	gap.GAP_PRODUCTS_STYLE_API = f"{base_url}/commerce/search/products/v2/style"
+	gap.GAP_BASE = base_url
+	gap.POWERREVIEWS_BASE = base_url
+
+
+@dataclass
+class BenchResult:
+	styles: int
+	pr_concurrency: int
+	rows: int
+	elapsed_s: float
+	rows_per_s: float
+	requests: Dict[str, int]
+	pr_requests_per_row: float
+	peak_mb: Optional[float]
+
+
+def run_once(
+	base_url: str,
+	*,
+	styles: int,
+	pr_concurrency: int,
+	args: argparse.Namespace,
+) -> BenchResult:
+	requests.get(f"{base_url}/__reset", timeout=10)
+	session = gap._make_session(
+		pool_size=max(pr_concurrency * args.pr_page_concurrency, args.gap_page_concurrency),
+		retry_policy=gap.RetryPolicy(attempts=args.retries),
+		rate_limits=gap._HostRateLimits(max_rate=args.max_rate, host_rates={"127.0.0.1": args.max_rate}),
+		http2=False,
+	)
+	if args.search:
+		cid: Optional[str] = None
+		category_url = f"{base_url}/browse/search.do?searchText=bench{styles}"
+	else:
+		cid = str(styles)
+		category_url = f"{base_url}/browse/category.do?cid={styles}"
+
+	if not args.no_memory:
+		tracemalloc.start()
+	t0 = time.perf_counter()
+	rows = gap.build_rows(
+		cid=cid,
+		locale="en_US",
+		category_url=category_url,
+		session=session,
+		max_products=None,
+		granularity=args.granularity,
+		reviews_mode=args.reviews,
+		search_name_filter=False,
+		pr_cache_path=None,
+		progress_every=0,
+		pr_concurrency=pr_concurrency,
+		pr_page_concurrency=args.pr_page_concurrency,
+		gap_page_concurrency=args.gap_page_concurrency,
+	)
+	n_rows = gap.write_csv(rows, os.devnull)
+	elapsed = time.perf_counter() - t0
+	peak_mb: Optional[float] = None
+	if not args.no_memory:
+		peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+		tracemalloc.stop()
+
+	counts = requests.get(f"{base_url}/__stats", timeout=10).json()
+	return BenchResult(
+		styles=styles,
+		pr_concurrency=pr_concurrency,
+		rows=n_rows,
+		elapsed_s=elapsed,
+		rows_per_s=(n_rows / elapsed if elapsed > 0 else 0.0),
+		requests=counts,
+		pr_requests_per_row=(counts.get("powerreviews", 0) / n_rows if n_rows else 0.0),
+		peak_mb=peak_mb,
+	)
+
+
+def parse_args() -> argparse.Namespace:
+	p = argparse.ArgumentParser(description="Benchmark gap.py build_rows against a local Gap/PowerReviews stand-in")
+	p.add_argument("--sizes", default="100,500,2000", help="Comma-separated style counts to run.")
+	p.add_argument("--pr-concurrency", default="4", help="Comma-separated --pr-concurrency values to compare.")
+	p.add_argument("--pr-page-concurrency", type=int, default=1)
+	p.add_argument("--gap-page-concurrency", type=int, default=4)
+	p.add_argument("--reviews", choices=["powerreviews", "powerreviews-bisect"], default="powerreviews")
+	p.add_argument("--granularity", choices=["auto", "style", "color"], default="style")
+	p.add_argument("--search", action="store_true", help="Use the /style (keyword search) listing instead of /cc.")
+	p.add_argument("--colors", type=int, default=3, help="Colors per style.")
+	p.add_argument("--max-reviews", type=int, default=600, help="Cap on reviews per style (long-tailed below it).")
+	p.add_argument("--history-years", type=int, default=8, help="Reviews are spread over this many years.")
+	p.add_argument("--latency-ms", type=float, default=0.0, help="Server-side delay added to every response.")
+	p.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429.")
+	p.add_argument("--retry-after", type=int, default=0, help="Retry-After seconds sent with injected 429s.")
+	p.add_argument("--retries", type=int, default=5)
+	p.add_argument("--max-rate", type=float, default=1000.0, help="Rate limiter ceiling (req/s) for the stand-in host.")
+	p.add_argument("--seed", type=int, default=1)
+	p.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (it slows allocation-heavy code).")
+	p.add_argument("--json-out", default="", help="Optional path for the results as JSON.")
+	return p.parse_args()
+
+
+def main() -> int:
+	args = parse_args()
+	cfg = StandInConfig(
+		colors=args.colors,
+		max_reviews=args.max_reviews,
+		history_years=args.history_years,
+		latency_ms=args.latency_ms,
+		error_rate=args.error_rate,
+		retry_after_s=args.retry_after,
+		seed=args.seed,
+	)
+	proc, base_url = start_stand_in(cfg)
+	point_gap_at(base_url)
+	results: List[BenchResult] = []
+	try:
+		print(f"{'styles':>7} {'conc':>5} {'rows':>7} {'secs':>8} {'rows/s':>9} {'PR/row':>7} {'429s':>6} {'peak MB':>8}  requests")
+		for styles in (int(s) for s in args.sizes.split(",") if s.strip()):
+			for conc in (int(c) for c in args.pr_concurrency.split(",") if c.strip()):
+				r = run_once(base_url, styles=styles, pr_concurrency=conc, args=args)
+				results.append(r)
+				peak = "-" if r.peak_mb is None else f"{r.peak_mb:.1f}"
+				by_endpoint = ", ".join(f"{k}={v}" for k, v in sorted(r.requests.items()))
+				print(
+					f"{r.styles:>7} {r.pr_concurrency:>5} {r.rows:>7} {r.elapsed_s:>8.2f} {r.rows_per_s:>9.1f} "
+					f"{r.pr_requests_per_row:>7.2f} {r.requests.get('429', 0):>6} {peak:>8}  {by_endpoint}"
+				)
+	finally:
+		proc.terminate()
+	if args.json_out:
+		with open(args.json_out, "w", encoding="utf-8") as f:
+			json.dump({"config": asdict(cfg), "results": [asdict(r) for r in results]}, f, indent=2)
+		print(f"Wrote {args.json_out}")
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
@@ -1,10 +1,14 @@
 import aiohttp
 import asyncio
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import json
+import os
+import random
 import re
 from collections import defaultdict
+from functools import lru_cache
 
 # Configuration
 BASE_URL = "https://www.clovia.com"
@@ -24,35 +28,274 @@ HEADERS = {
 # Semaphore to limit concurrent requests
 MAX_CONCURRENT_REQUESTS = 20
 
-class CloviaScraper:
+# Products processed at once by scrape_all; each worker handles one product at a time
+NUM_WORKERS = MAX_CONCURRENT_REQUESTS
+
+# Per-slug results from earlier runs, used to skip products whose review_count is unchanged
+STATE_FILE = "clovia_state.json"
+
+# fetch_json retries these statuses, timeouts and connection errors with jittered exponential backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+# Upper bound for a server-supplied Retry-After
+RETRY_AFTER_MAX = 120.0
+
+# Requests that still failed after re-driving, kept for the next run
+DEAD_LETTER_FILE = "clovia_dead_letters.json"
+
+# Review pages of one product in flight at once; also bounds how many pages are held in memory
+REVIEW_PAGE_WORKERS = 8
+
+# Review dates are buffered per product and parsed in one vectorised call once this many are
+# pending; smaller leftovers are parsed one by one, where pandas' per-call overhead would dominate
+BULK_PARSE_BATCH = 2048
+BULK_PARSE_MIN = 64
+
+# Distinct date strings remembered by parse_date_string
+DATE_CACHE_SIZE = 1 << 16
+
+API_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+MONTHS = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+
+class ReviewTally:
+    """Running review counts for one product, folded in one page at a time"""
+    
     def __init__(self):
+        self.year_counts = defaultdict(int)
+        self.month_counts = defaultdict(int)
+        self.newest = None
+        self.failed_pages = 0
+        self.pending_dates = []
+    
+    def add(self, parsed_date):
+        self.year_counts[parsed_date.year] += 1
+        self.month_counts[f"{parsed_date.year}-{parsed_date.month:02d}"] += 1
+        if self.newest is None or parsed_date > self.newest:
+            self.newest = parsed_date
+    
+    def add_many(self, parsed):
+        """Add a Series of parsed dates; NaT entries are skipped"""
+        parsed = parsed.dropna()
+        if parsed.empty:
+            return
+        keys = parsed.dt.year * 100 + parsed.dt.month
+        for key, count in keys.value_counts().items():
+            year, month = divmod(int(key), 100)
+            self.year_counts[year] += int(count)
+            self.month_counts[f"{year}-{month:02d}"] += int(count)
+        newest = parsed.max().to_pydatetime()
+        if self.newest is None or newest > self.newest:
+            self.newest = newest
+
+
+def parse_api_date(date_str):
+    """Fast path for the API's "YYYY-MM-DD HH:MM:SS" format; None for anything else"""
+    if (len(date_str) != 19 or date_str[4] != "-" or date_str[7] != "-"
+            or date_str[10] != " " or date_str[13] != ":" or date_str[16] != ":"):
+        return None
+    try:
+        return datetime(
+            int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+            int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+        )
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date_string(date_str):
+    """Parse a review date string in any of the known formats (memoised)"""
+    if not date_str:
+        return None
+    try:
+        # API format: "2025-03-27 22:33:13"
+        formats = [
+            "%Y-%m-%d %H:%M:%S",
+            "%Y-%m-%d",
+            "%b %d, %Y",
+            "%d %b %Y",
+            "%B %d, %Y",
+            "%d %B %Y",
+            "%d-%m-%Y",
+            "%d/%m/%Y"
+        ]
+        for fmt in formats:
+            try:
+                return datetime.strptime(str(date_str).strip(), fmt)
+            except:
+                continue
+        
+        # Try to extract date from various patterns
+        patterns = [
+            r'(\d{4})-(\d{2})-(\d{2})',  # 2025-03-27
+            r'(\d{1,2})\s*(?:st|nd|rd|th)?\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*,?\s*(\d{4})',
+            r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*(\d{1,2})\s*(?:st|nd|rd|th)?\s*,?\s*(\d{4})',
+        ]
+        
+        # Check for YYYY-MM-DD pattern first
+        match = re.search(r'(\d{4})-(\d{2})-(\d{2})', str(date_str))
+        if match:
+            year, month, day = match.groups()
+            return datetime(int(year), int(month), int(day))
+        
+        month_map = {
+            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+            'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+        }
+        
+        for pattern in patterns[1:]:
+            match = re.search(pattern, str(date_str), re.IGNORECASE)
+            if match:
+                groups = match.groups()
+                if groups[0].isdigit():
+                    day, month_str, year = groups
+                else:
+                    month_str, day, year = groups
+                month = month_map.get(month_str.lower()[:3], 1)
+                return datetime(int(year), month, int(day))
+        
+        return None
+    except Exception as e:
+        return None
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_delay(attempt, retry_after=None):
+    """Backoff before the next attempt: Retry-After when given, else full-jitter exponential"""
+    if retry_after is not None:
+        # A little jitter so requests held back together do not all return at once
+        return min(retry_after, RETRY_AFTER_MAX) + random.uniform(0, RETRY_BASE_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+
+
+class CloviaScraper:
+    def __init__(self, state_path=STATE_FILE, dead_letter_path=DEAD_LETTER_FILE):
         self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         self.products_data = []
         self.session = None
-        
-    async def fetch_json(self, url, content_type_check=True):
-        """Fetch JSON from URL with rate limiting"""
-        async with self.semaphore:
-            try:
-                async with self.session.get(url, headers=HEADERS, timeout=30) as response:
-                    if response.status == 200:
-                        # Read text first, then parse JSON
-                        text = await response.text()
-                        try:
-                            return json.loads(text)
-                        except json.JSONDecodeError:
-                            # Not valid JSON (probably HTML)
+        self.state_path = state_path
+        self.state = self.load_state()
+        self.incremental = True
+        self.reused_count = 0
+        self.dead_letter_path = dead_letter_path
+        self.dead_letters = []
+        # Products with a request left over from the last run are always fetched again
+        self.retry_slugs = {d["slug"] for d in self.load_dead_letters() if d.get("slug")}
+        
+    def load_state(self):
+        """Load per-slug results saved by an earlier run ({} if there is none)"""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable state file {self.state_path}: {e}")
+            return {}
+        return state if isinstance(state, dict) else {}
+    
+    def save_state(self):
+        """Write per-slug results atomically so an interrupted save keeps the previous file"""
+        if not self.state_path:
+            return
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.state_path)
+    
+    def load_dead_letters(self):
+        """Load the requests that still failed at the end of the last run ([] if there are none)"""
+        if not self.dead_letter_path or not os.path.exists(self.dead_letter_path):
+            return []
+        try:
+            with open(self.dead_letter_path, "r", encoding="utf-8") as f:
+                letters = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable dead-letter file {self.dead_letter_path}: {e}")
+            return []
+        return letters if isinstance(letters, list) else []
+    
+    def save_dead_letters(self):
+        """Write the remaining dead letters for the next run, or remove the file if there are none"""
+        if not self.dead_letter_path:
+            return
+        if not self.dead_letters:
+            if os.path.exists(self.dead_letter_path):
+                os.remove(self.dead_letter_path)
+            return
+        tmp = f"{self.dead_letter_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.dead_letters, f, indent=2)
+        os.replace(tmp, self.dead_letter_path)
+        print(f"{len(self.dead_letters)} requests still failing; saved to {self.dead_letter_path}")
+    
+    async def fetch_json(self, url, content_type_check=True, context=None):
+        """Fetch JSON from URL with rate limiting
+        
+        429/5xx responses, timeouts and connection errors are retried with jittered exponential
+        backoff that honours Retry-After; the semaphore is released while waiting. A request
+        that exhausts its attempts is added to self.dead_letters along with `context`
+        (kind, slug, page) so scrape_all can re-drive it, and None is returned.
+        """
+        reason = None
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            retry_after = None
+            async with self.semaphore:
+                try:
+                    async with self.session.get(url, headers=HEADERS, timeout=30) as response:
+                        if response.status == 200:
+                            # Read text first, then parse JSON
+                            text = await response.text()
+                            try:
+                                return json.loads(text)
+                            except json.JSONDecodeError:
+                                # Not valid JSON (probably HTML)
+                                return None
+                        elif response.status not in RETRY_STATUSES:
                             return None
-                    else:
-                        return None
-            except Exception as e:
-                print(f"Exception fetching {url}: {e}")
-                return None
+                        reason = f"HTTP {response.status}"
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    reason = f"{type(e).__name__}: {e}"
+                except Exception as e:
+                    print(f"Exception fetching {url}: {e}")
+                    return None
+            if attempt < MAX_ATTEMPTS:
+                await asyncio.sleep(retry_delay(attempt, retry_after))
+        
+        print(f"Giving up on {url} after {MAX_ATTEMPTS} attempts ({reason})")
+        self.dead_letters.append({
+            **(context or {}),
+            "url": url,
+            "reason": reason,
+            "failed_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        return None
     
     async def get_total_pages(self):
         """Get total number of pages from first API call"""
         url = f"{CATEGORY_API}1"
-        data = await self.fetch_json(url)
+        data = await self.fetch_json(url, context={"kind": "category", "page": 1})
         if data and data.get("status") == "success":
             total_count = data["result"].get("total_count", 0)
             page_size = data["result"].get("size", 12)
@@ -61,132 +304,99 @@ class CloviaScraper:
             return total_pages, data["result"].get("products", [])
         return 0, []
     
-    async def fetch_all_category_products(self, max_pages=None):
-        """Fetch all products from category listing"""
+    async def produce_category_products(self, queue, max_pages=None):
+        """Put (index, product) on the queue as listing pages arrive; return the number queued"""
         total_pages, first_page_products = await self.get_total_pages()
         
         if max_pages:
             total_pages = min(total_pages, max_pages)
         
-        all_products = first_page_products
+        queued = 0
+        for product in first_page_products:
+            await queue.put((queued, product))
+            queued += 1
         
-        # Fetch remaining pages concurrently
+        # All remaining pages are requested at once; awaiting them in page order keeps the
+        # index equal to the listing position while workers start on the first pages
         if total_pages > 1:
-            tasks = [self.fetch_json(f"{CATEGORY_API}{page}") for page in range(2, total_pages + 1)]
-            results = await asyncio.gather(*tasks)
-            
-            for data in results:
+            tasks = [
+                asyncio.create_task(self.fetch_json(f"{CATEGORY_API}{page}", context={"kind": "category", "page": page}))
+                for page in range(2, total_pages + 1)
+            ]
+            for task in tasks:
+                data = await task
                 if data and data.get("status") == "success":
-                    products = data["result"].get("products", [])
-                    all_products.extend(products)
+                    for product in data["result"].get("products", []):
+                        await queue.put((queued, product))
+                        queued += 1
         
-        print(f"Fetched {len(all_products)} products from category listing")
-        return all_products
+        print(f"Fetched {queued} products from category listing")
+        return queued
     
     async def fetch_product_details(self, slug):
         """Fetch detailed product information including sold_count"""
         url = f"{PRODUCT_DETAIL_API}{slug}/"
-        return await self.fetch_json(url)
+        return await self.fetch_json(url, context={"kind": "details", "slug": slug})
     
     async def fetch_product_reviews(self, slug, page=1):
         """Fetch reviews for a product"""
         url = f"{PRODUCT_REVIEW_API}{slug}/web-reviews/s/?page={page}"
-        return await self.fetch_json(url)
+        return await self.fetch_json(url, context={"kind": "reviews", "slug": slug, "page": page})
     
-    async def fetch_all_reviews_for_product(self, slug, max_pages=100):
-        """Fetch all reviews for a product (paginated)"""
-        all_reviews = []
+    async def count_reviews_for_product(self, slug):
+        """Count a product's reviews page by page; returns a ReviewTally, or None if page 1 failed
         
-        # First page
+        Each page is folded into the tally as soon as it arrives and then dropped, so memory
+        does not grow with the number of reviews and every page is counted.
+        """
         first_page = await self.fetch_product_reviews(slug, 1)
         if not first_page:
-            return all_reviews
-        
-        # Handle the actual API response structure
-        reviews = first_page.get("object_list", [])
-        all_reviews.extend(reviews)
+            return None
         
-        total_reviews = first_page.get("total_reviews", 0)
+        tally = ReviewTally()
+        self.fold_reviews(first_page.get("object_list", []), tally)
         num_pages = first_page.get("num_pages", 1)
-        has_next = first_page.get("has_next", False)
+        if num_pages <= 1 or not first_page.get("has_next", False):
+            self.flush_review_dates(tally)
+            return tally
         
-        # Limit pages to avoid too many requests
-        total_pages = min(num_pages, max_pages)
+        # A few page workers share one page iterator, so at most REVIEW_PAGE_WORKERS pages are in flight
+        pages = iter(range(2, num_pages + 1))
         
-        # Fetch remaining pages if there are more
-        if total_pages > 1 and has_next:
-            tasks = [self.fetch_product_reviews(slug, page) for page in range(2, total_pages + 1)]
-            results = await asyncio.gather(*tasks)
-            
-            for data in results:
+        async def page_worker():
+            for page in pages:
+                data = await self.fetch_product_reviews(slug, page)
                 if data:
-                    reviews = data.get("object_list", [])
-                    all_reviews.extend(reviews)
+                    self.fold_reviews(data.get("object_list", []), tally)
+                else:
+                    tally.failed_pages += 1
         
-        return all_reviews
+        await asyncio.gather(*(page_worker() for _ in range(min(REVIEW_PAGE_WORKERS, num_pages - 1))))
+        self.flush_review_dates(tally)
+        return tally
     
     def parse_review_date(self, date_str):
         """Parse review date string and return datetime object"""
         if not date_str:
             return None
-        try:
-            # API format: "2025-03-27 22:33:13"
-            formats = [
-                "%Y-%m-%d %H:%M:%S",
-                "%Y-%m-%d",
-                "%b %d, %Y",
-                "%d %b %Y",
-                "%B %d, %Y",
-                "%d %B %Y",
-                "%d-%m-%Y",
-                "%d/%m/%Y"
-            ]
-            for fmt in formats:
-                try:
-                    return datetime.strptime(str(date_str).strip(), fmt)
-                except:
-                    continue
-            
-            # Try to extract date from various patterns
-            patterns = [
-                r'(\d{4})-(\d{2})-(\d{2})',  # 2025-03-27
-                r'(\d{1,2})\s*(?:st|nd|rd|th)?\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*,?\s*(\d{4})',
-                r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*(\d{1,2})\s*(?:st|nd|rd|th)?\s*,?\s*(\d{4})',
-            ]
-            
-            # Check for YYYY-MM-DD pattern first
-            match = re.search(r'(\d{4})-(\d{2})-(\d{2})', str(date_str))
-            if match:
-                year, month, day = match.groups()
-                return datetime(int(year), int(month), int(day))
-            
-            month_map = {
-                'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-                'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-            }
-            
-            for pattern in patterns[1:]:
-                match = re.search(pattern, str(date_str), re.IGNORECASE)
-                if match:
-                    groups = match.groups()
-                    if groups[0].isdigit():
-                        day, month_str, year = groups
-                    else:
-                        month_str, day, year = groups
-                    month = month_map.get(month_str.lower()[:3], 1)
-                    return datetime(int(year), month, int(day))
-            
-            return None
-        except Exception as e:
-            return None
+        text = str(date_str).strip()
+        # Nearly every API date is "YYYY-MM-DD HH:MM:SS"; only other formats reach the cached slow path
+        return parse_api_date(text) or parse_date_string(text)
     
-    def count_reviews_by_year_month(self, reviews):
-        """Count reviews by year and by month for 2024"""
-        year_counts = defaultdict(int)
-        month_2025_counts = defaultdict(int)
-        
-        months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
-        
+    def parse_review_dates(self, date_strs):
+        """Parse many review date strings at once; returns a datetime Series with NaT where unparseable"""
+        raw = pd.Series(date_strs, dtype=object)
+        parsed = pd.to_datetime(raw, format=API_DATE_FORMAT, errors="coerce")
+        
+        # Anything not in the API format goes through the scalar parser, then is written back in one go
+        odd = (parsed.isna() & raw.astype(bool)).to_numpy().nonzero()[0]
+        if len(odd):
+            fallback = pd.to_datetime([self.parse_review_date(raw.iat[i]) for i in odd], errors="coerce")
+            parsed.iloc[odd] = fallback
+        return parsed
+    
+    def fold_reviews(self, reviews, tally):
+        """Add the dates of one page of reviews to a ReviewTally (buffered; see flush_review_dates)"""
         for review in reviews:
             # Handle array format from API: [id, title, content, product_id, user_id, verified, name, date, ...]
             # The date is at index 7 in the array
@@ -197,17 +407,32 @@ class CloviaScraper:
             else:
                 continue
             
+            if date_str:
+                tally.pending_dates.append(date_str)
+        
+        if len(tally.pending_dates) >= BULK_PARSE_BATCH:
+            self.flush_review_dates(tally)
+    
+    def flush_review_dates(self, tally):
+        """Parse a tally's buffered date strings and add them to its counts"""
+        pending, tally.pending_dates = tally.pending_dates, []
+        if len(pending) >= BULK_PARSE_MIN:
+            tally.add_many(self.parse_review_dates(pending))
+            return
+        for date_str in pending:
             parsed_date = self.parse_review_date(date_str)
-            
             if parsed_date:
-                year = parsed_date.year
-                year_counts[year] += 1
-                
-                if year == 2025:
-                    month_idx = parsed_date.month - 1
-                    month_2025_counts[months[month_idx]] += 1
-        
-        return year_counts, month_2025_counts
+                tally.add(parsed_date)
+    
+    def apply_review_counts(self, product_data, year_counts, month_counts):
+        """Fill the year and 2025 month columns from year / "YYYY-MM" counts"""
+        for year, count in year_counts.items():
+            if 2020 <= int(year) <= 2026:
+                product_data[f"{int(year)} Review Count"] = count
+        
+        for month, count in month_counts.items():
+            if month.startswith("2025-"):
+                product_data[f"2025_{MONTHS[int(month[5:]) - 1]}"] = count
     
     def extract_size_counts(self, product_detail):
         """Extract size availability counts from product detail"""
@@ -276,26 +501,39 @@ class CloviaScraper:
         for year in range(2020, 2027):
             product_data[f"{year} Review Count"] = 0
         
-        months = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
-        for month in months:
+        for month in MONTHS:
             product_data[f"2025_{month}"] = 0
         
-        # Fetch detailed reviews if enabled and there are reviews
+        # Carry forward the last run's results while the listing review_count is unchanged
+        cached = None
+        if fetch_reviews and self.incremental and slug and slug not in self.retry_slugs:
+            cached = self.state.get(slug)
+        if cached and cached.get("review_count") == product.get("review_count", 0):
+            self.apply_review_counts(product_data, cached.get("year_counts", {}), cached.get("month_counts", {}))
+            product_data["Sold Count"] = cached.get("sold_count", 0)
+            product_data["Ratings Count"] = cached.get("ratings_count", 0)
+            self.reused_count += 1
+            return product_data
+        
+        # Reviews and details are independent, so fetch them concurrently
+        fetches = {}
         if fetch_reviews and product.get("review_count", 0) > 0 and slug:
-            reviews = await self.fetch_all_reviews_for_product(slug)
-            if reviews:
-                year_counts, month_2025_counts = self.count_reviews_by_year_month(reviews)
-                
-                for year, count in year_counts.items():
-                    if 2020 <= year <= 2026:
-                        product_data[f"{year} Review Count"] = count
-                
-                for month, count in month_2025_counts.items():
-                    product_data[f"2025_{month}"] = count
-        
-        # Fetch product details for sold_count and ratings count
+            fetches["reviews"] = self.count_reviews_for_product(slug)
         if slug:
-            details = await self.fetch_product_details(slug)
+            fetches["details"] = self.fetch_product_details(slug)
+        fetched = dict(zip(fetches, await asyncio.gather(*fetches.values())))
+        
+        # Fill in review date breakdowns
+        year_counts, month_counts, newest = {}, {}, None
+        if "reviews" in fetched:
+            tally = fetched["reviews"]
+            if tally:
+                year_counts, month_counts, newest = tally.year_counts, tally.month_counts, tally.newest
+                self.apply_review_counts(product_data, year_counts, month_counts)
+        
+        # Product details for sold_count and ratings count
+        if "details" in fetched:
+            details = fetched["details"]
             if details:
                 # Extract sold_count from rvp object
                 rvp = details.get("rvp", {})
@@ -309,30 +547,111 @@ class CloviaScraper:
                     if isinstance(first_rating, (int, float)):
                         product_data["Ratings Count"] = int(first_rating)
         
+        # Remember complete results only; a failed fetch is retried on the next run
+        reviews_ok = "reviews" not in fetched or (fetched["reviews"] is not None and fetched["reviews"].failed_pages == 0)
+        if fetch_reviews and slug and reviews_ok and fetched.get("details"):
+            self.state[slug] = {
+                "review_count": product.get("review_count", 0),
+                "year_counts": {str(year): count for year, count in year_counts.items()},
+                "month_counts": dict(month_counts),
+                "newest_review": newest.strftime("%Y-%m-%d %H:%M:%S") if newest else None,
+                "sold_count": product_data["Sold Count"],
+                "ratings_count": product_data["Ratings Count"],
+                "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        
         return product_data
     
-    async def scrape_all(self, max_pages=None, fetch_reviews=True, fetch_details=False):
-        """Main scraping function"""
+    async def _product_worker(self, queue, results, listed, fetch_reviews, fetch_details):
+        """Process products from the queue until a None sentinel arrives"""
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                index, product = item
+                listed[product.get("slug", "")] = (index, product)
+                results[index] = await self.process_product(product, fetch_reviews, fetch_details)
+                if len(results) % 50 == 0:
+                    print(f"Processed {len(results)} products")
+            finally:
+                queue.task_done()
+    
+    async def redrive_dead_letters(self, results, listed, fetch_reviews, fetch_details):
+        """Retry what failed during the run: missed listing pages and products with a failed request
+        
+        Products are processed again from scratch and their rows replaced. Requests that fail
+        again end up back in self.dead_letters.
+        """
+        letters, self.dead_letters = self.dead_letters, []
+        print(f"Re-driving {len(letters)} failed requests...")
+        
+        targets = {}
+        next_index = max(results, default=-1) + 1
+        for letter in letters:
+            if letter.get("kind") == "category":
+                context = {"kind": "category", "page": letter.get("page")}
+                data = await self.fetch_json(letter["url"], context=context)
+                if not (data and data.get("status") == "success"):
+                    continue
+                for product in data["result"].get("products", []):
+                    slug = product.get("slug", "")
+                    if slug not in listed:
+                        listed[slug] = (next_index, product)
+                        targets[slug] = listed[slug]
+                        next_index += 1
+            elif letter.get("slug") in listed:
+                targets[letter["slug"]] = listed[letter["slug"]]
+        
+        rows = await asyncio.gather(
+            *(self.process_product(product, fetch_reviews, fetch_details) for _, product in targets.values())
+        )
+        for (index, _), row in zip(targets.values(), rows):
+            results[index] = row
+        print(f"Re-drove {len(targets)} products, {len(self.dead_letters)} requests still failing")
+    
+    async def scrape_all(
+        self, max_pages=None, fetch_reviews=True, fetch_details=False, num_workers=NUM_WORKERS, incremental=True
+    ):
+        """Main scraping function
+        
+        With incremental=True, products whose listing review_count matches the saved state are
+        carried forward without any review or detail requests.
+        """
+        self.incremental = incremental
+        self.reused_count = 0
         connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS, limit_per_host=MAX_CONCURRENT_REQUESTS)
         async with aiohttp.ClientSession(connector=connector) as session:
             self.session = session
             
+            # Listing pages feed the queue while a fixed pool of workers processes products, so
+            # one product with many review pages only occupies its own worker
             print("Fetching product listings...")
-            products = await self.fetch_all_category_products(max_pages)
-            
-            print(f"Processing {len(products)} products...")
-            
-            # Process products in batches for progress tracking
-            batch_size = 50
-            all_product_data = []
-            
-            for i in range(0, len(products), batch_size):
-                batch = products[i:i+batch_size]
-                tasks = [self.process_product(p, fetch_reviews, fetch_details) for p in batch]
-                batch_results = await asyncio.gather(*tasks)
-                all_product_data.extend(batch_results)
-                print(f"Processed {min(i+batch_size, len(products))}/{len(products)} products")
+            queue = asyncio.Queue()
+            results = {}
+            listed = {}
+            workers = [
+                asyncio.create_task(self._product_worker(queue, results, listed, fetch_reviews, fetch_details))
+                for _ in range(max(1, num_workers))
+            ]
+            try:
+                total = await self.produce_category_products(queue, max_pages)
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+                print(f"Processed {len(results)}/{total} products ({self.reused_count} unchanged since the last run)")
+                
+                if self.dead_letters:
+                    await self.redrive_dead_letters(results, listed, fetch_reviews, fetch_details)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                # Saved even after a failure so finished products are not fetched again
+                self.save_state()
+                self.save_dead_letters()
             
+            # Keep listing order in the output
+            all_product_data = [results[i] for i in sorted(results)]
             self.products_data = all_product_data
             return all_product_data
     
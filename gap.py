@@ -1,23 +1,40 @@
 from __future__ import annotations
 
 import argparse
+import base64
+import codecs
 import csv
 import dataclasses
+import heapq
 import json
 import os
 import re
+import sqlite3
+import threading
 import time
-from dataclasses import dataclass
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from urllib.parse import parse_qs, urlparse
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
 
 
 GAP_PRODUCTS_CC_API = "https://api.gap.com/commerce/search/products/v2/cc"
 GAP_PRODUCTS_STYLE_API = "https://api.gap.com/commerce/search/products/v2/style"
 GAP_BASE = "https://www.gap.com"
+POWERREVIEWS_BASE = "https://display.powerreviews.com"
+# Year columns run from this year to the current one unless --years says otherwise.
+DEFAULT_FIRST_YEAR = 2020
+# Version of the per-style PowerReviews cache record (see _review_counts_to_record).
+PR_CACHE_SCHEMA_VERSION = 2
 
 
 @dataclass(frozen=True)
@@ -27,6 +44,24 @@ class PowerReviewsConfig:
 	locale: str = "en_US"
 
 
+# Listing payloads are projected into these as each page arrives; the raw JSON is not kept.
+@dataclass(frozen=True, slots=True)
+class GapColor:
+	pid: Optional[str]  # id, else ccId (how search items link to a PDP)
+	ccid: Optional[str]  # ccId, else id (how category styles list their colors)
+	name: str
+	price: Optional[float]
+
+
+@dataclass(frozen=True, slots=True)
+class GapProduct:
+	style_id: Optional[str]
+	name: str
+	rating: Optional[float]
+	review_count: Optional[int]
+	colors: Tuple[GapColor, ...]
+
+
 @dataclass(frozen=True)
 class ProductRow:
 	brand_name: str
@@ -36,29 +71,613 @@ class ProductRow:
 	customer_reviews_count: Optional[int]
 	product_url: str
 	customer_reviews_last_12_months_count: Optional[int]
-	customer_reviews_2020_count: Optional[int]
-	customer_reviews_2021_count: Optional[int]
-	customer_reviews_2022_count: Optional[int]
-	customer_reviews_2023_count: Optional[int]
-	customer_reviews_2024_count: Optional[int]
-	customer_reviews_2025_count: Optional[int]
-
-
-def _requests_session() -> requests.Session:
-	session = requests.Session()
-	session.headers.update(
-		{
-			"User-Agent": (
-				"Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-				"AppleWebKit/537.36 (KHTML, like Gecko) "
-				"Chrome/120.0.0.0 Safari/537.36"
-			),
-			"Accept": "application/json,text/plain,*/*",
+	# Review count per calendar year for the configured year range (None when unknown).
+	year_counts: Dict[int, Optional[int]]
+	# Extra --bucket windows, keyed by bucket label (None when they cannot be derived).
+	bucket_counts: Dict[str, Optional[int]] = dataclasses.field(default_factory=dict)
+	# When the PowerReviews counts were computed (epoch ms); None for gap-only or pending rows.
+	counts_as_of_ms: Optional[int] = None
+	# Category label (cid-... / search-...), filled in for multi-category runs.
+	category: str = ""
+
+
+@dataclass(frozen=True)
+class ReviewCounts:
+	last12: int
+	# Per-year totals for entries without a monthly histogram (bisect mode, old cache entries).
+	years: Dict[int, int]
+	total: int
+	# Watermark: the newest review seen when these counts were computed (used by --pr-refresh).
+	newest_ms: Optional[int] = None
+	newest_id: Optional[str] = None
+	as_of_ms: Optional[int] = None
+	# Sorted created_date values (epoch ms, int64) so new windows can be counted without
+	# re-fetching. They reach back to timestamps_floor_ms, or to the first review when that is None.
+	timestamps: Optional[np.ndarray] = dataclasses.field(default=None, compare=False, repr=False)
+	timestamps_floor_ms: Optional[int] = None
+	# Monthly histogram ("YYYY-MM" -> reviews) over the same history as the timestamps; year
+	# columns are summed from it, so any year range can be reported without a re-crawl.
+	months: Optional[Dict[str, int]] = None
+	# Gap listing reviewCount these counts were computed against; a different listing value
+	# means the style has new reviews and is refreshed.
+	gap_review_count: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ReviewBucket:
+	label: str
+	start_ms: int
+	end_ms: int
+
+
+_BROWSER_HEADERS = {
+	"User-Agent": (
+		"Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+		"AppleWebKit/537.36 (KHTML, like Gecko) "
+		"Chrome/120.0.0.0 Safari/537.36"
+	),
+	"Accept": "application/json,text/plain,*/*",
+	# "br" is only advertised when a brotli decoder is installed (urllib3 / httpx pick it up).
+	"Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+	attempts: int = 5
+	backoff_s: float = 0.5
+	max_backoff_s: float = 10.0
+	# Upper bound for a server-supplied Retry-After, so one bad header cannot stall a run.
+	max_retry_after_s: float = 120.0
+	statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+
+def _retry_after_s(resp: Any) -> Optional[float]:
+	value = resp.headers.get("Retry-After") if resp is not None else None
+	if not value:
+		return None
+	try:
+		return max(0.0, float(value))
+	except ValueError:
+		pass
+	try:
+		when = parsedate_to_datetime(value)
+	except (TypeError, ValueError):
+		return None
+	if when.tzinfo is None:
+		when = when.replace(tzinfo=timezone.utc)
+	return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _backoff_s(policy: RetryPolicy, attempt: int, resp: Any = None) -> float:
+	retry_after = _retry_after_s(resp)
+	if retry_after is not None:
+		return min(policy.max_retry_after_s, retry_after)
+	# Exponential backoff with a small floor.
+	return min(policy.max_backoff_s, policy.backoff_s * (2 ** (attempt - 1)))
+
+
+class _AdaptiveRateLimiter:
+	"""Per-host token bucket whose rate follows how the host responds (AIMD)."""
+
+	def __init__(
+		self,
+		*,
+		rate: float,
+		max_rate: float,
+		min_rate: float = 0.2,
+		increase: float = 0.25,
+		decrease: float = 0.5,
+	) -> None:
+		self.max_rate = max(min_rate, max_rate)
+		self.min_rate = min_rate
+		self.rate = min(max(rate, min_rate), self.max_rate)
+		self._increase = increase
+		self._decrease = decrease
+		self._lock = threading.Lock()
+		self._tokens = 1.0
+		self._updated = time.monotonic()
+		self._blocked_until = 0.0
+		self._last_decrease = 0.0
+
+	def acquire(self) -> float:
+		"""Block until a request may be sent; return the seconds spent waiting."""
+		waited = 0.0
+		while True:
+			with self._lock:
+				now = time.monotonic()
+				self._refill(now)
+				if now >= self._blocked_until and self._tokens >= 1.0:
+					self._tokens -= 1.0
+					return waited
+				if now < self._blocked_until:
+					wait_s = self._blocked_until - now
+				else:
+					wait_s = (1.0 - self._tokens) / self.rate
+			time.sleep(wait_s)
+			waited += wait_s
+
+	def record(self, status: Optional[int], retry_after_s: Optional[float] = None) -> None:
+		"""Feed back one outcome: an HTTP status, or None for a timeout / connection error."""
+		with self._lock:
+			now = time.monotonic()
+			self._refill(now)
+			if status is None or status == 429 or status >= 500:
+				if now - self._last_decrease >= 1.0:
+					self.rate = max(self.min_rate, self.rate * self._decrease)
+					self._last_decrease = now
+				if retry_after_s:
+					self._blocked_until = max(self._blocked_until, now + retry_after_s)
+					self._tokens = min(self._tokens, 0.0)
+			else:
+				self.rate = min(self.max_rate, self.rate + self._increase)
+
+	def _refill(self, now: float) -> None:
+		# Allow at most one second's worth of burst.
+		burst = max(1.0, self.rate)
+		self._tokens = min(burst, self._tokens + (now - self._updated) * self.rate)
+		self._updated = now
+
+
+class _HostRateLimits:
+	"""One ``_AdaptiveRateLimiter`` per host, created on first use."""
+
+	def __init__(self, *, max_rate: float, host_rates: Optional[Dict[str, float]] = None) -> None:
+		self._max_rate = max_rate
+		self._host_rates = dict(host_rates or {})
+		self._limiters: Dict[str, _AdaptiveRateLimiter] = {}
+		self._lock = threading.Lock()
+
+	def for_url(self, url: str) -> _AdaptiveRateLimiter:
+		host = urlparse(url).hostname or ""
+		with self._lock:
+			limiter = self._limiters.get(host)
+			if limiter is None:
+				rate = self._host_rates.get(host, self._max_rate)
+				limiter = _AdaptiveRateLimiter(rate=rate, max_rate=self._max_rate)
+				self._limiters[host] = limiter
+			return limiter
+
+
+# Upper bounds (seconds) of the request latency histogram buckets; +Inf is implicit.
+_LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _endpoint_for_url(url: str) -> str:
+	# Compared against the module constants at call time so redirected endpoints are still labelled.
+	if url.startswith(GAP_PRODUCTS_CC_API) or url.startswith(GAP_PRODUCTS_STYLE_API):
+		return "gap_listing"
+	if url.startswith(f"{GAP_BASE}/browse/product.do"):
+		return "gap_pdp"
+	if url.startswith(POWERREVIEWS_BASE):
+		return "powerreviews"
+	return "other"
+
+
+def _response_bytes(resp: Any, *, stream: bool) -> int:
+	# Content-Length is the size on the wire. Without it a streamed body is not counted, since
+	# reading it here would defeat the caller's early exit.
+	length = _safe_int(resp.headers.get("Content-Length"))
+	if length is not None:
+		return length
+	return 0 if stream else len(resp.content)
+
+
+@dataclass
+class _EndpointMetrics:
+	latency_buckets: List[int] = field(default_factory=lambda: [0] * (len(_LATENCY_BUCKETS_S) + 1))
+	latency_sum_s: float = 0.0
+	requests: int = 0
+	statuses: Dict[str, int] = field(default_factory=dict)
+	retries: int = 0
+	transport_errors: int = 0
+	bytes_received: int = 0
+	rate_limit_wait_s: float = 0.0
+	backoff_s: float = 0.0
+
+	def latency_quantile(self, q: float) -> Optional[float]:
+		"""Estimate a latency quantile from the histogram (linear within a bucket, like Prometheus)."""
+		if self.requests == 0:
+			return None
+		rank = q * self.requests
+		seen = 0
+		lower = 0.0
+		for upper, n in zip(_LATENCY_BUCKETS_S, self.latency_buckets):
+			if n and seen + n >= rank:
+				return round(lower + (upper - lower) * (rank - seen) / n, 4)
+			seen += n
+			lower = upper
+		return _LATENCY_BUCKETS_S[-1]
+
+
+class _HttpMetrics:
+	"""Per-endpoint latency, status, retry, byte and sleep counters; each attempt is observed separately."""
+
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self._endpoints: Dict[str, _EndpointMetrics] = {}
+		self._started = time.monotonic()
+
+	def _get(self, endpoint: str) -> _EndpointMetrics:
+		m = self._endpoints.get(endpoint)
+		if m is None:
+			m = self._endpoints[endpoint] = _EndpointMetrics()
+		return m
+
+	def observe(self, endpoint: str, *, latency_s: float, status: Optional[int], nbytes: int = 0) -> None:
+		"""Record one attempt; ``status`` is None for a timeout or connection error."""
+		i = next((k for k, upper in enumerate(_LATENCY_BUCKETS_S) if latency_s <= upper), len(_LATENCY_BUCKETS_S))
+		with self._lock:
+			m = self._get(endpoint)
+			m.requests += 1
+			m.latency_sum_s += latency_s
+			m.latency_buckets[i] += 1
+			m.bytes_received += nbytes
+			if status is None:
+				m.transport_errors += 1
+			else:
+				m.statuses[str(status)] = m.statuses.get(str(status), 0) + 1
+
+	def add_retry(self, endpoint: str) -> None:
+		with self._lock:
+			self._get(endpoint).retries += 1
+
+	def add_sleep(self, endpoint: str, seconds: float, *, reason: str) -> None:
+		with self._lock:
+			m = self._get(endpoint)
+			if reason == "rate_limit":
+				m.rate_limit_wait_s += seconds
+			else:
+				m.backoff_s += seconds
+
+	def summary(self) -> Dict[str, Any]:
+		with self._lock:
+			endpoints = {
+				k: dataclasses.replace(v, statuses=dict(v.statuses), latency_buckets=list(v.latency_buckets))
+				for k, v in self._endpoints.items()
+			}
+		out: Dict[str, Any] = {"elapsed_s": round(time.monotonic() - self._started, 3), "endpoints": {}}
+		for name, m in sorted(endpoints.items()):
+			cumulative = 0
+			buckets: Dict[str, int] = {}
+			for upper, n in zip(list(_LATENCY_BUCKETS_S) + [float("inf")], m.latency_buckets):
+				cumulative += n
+				buckets["+Inf" if upper == float("inf") else f"{upper:g}"] = cumulative
+			out["endpoints"][name] = {
+				"requests": m.requests,
+				"statuses": m.statuses,
+				"retries": m.retries,
+				"transport_errors": m.transport_errors,
+				"bytes_received": m.bytes_received,
+				"latency_s": {
+					"sum": round(m.latency_sum_s, 3),
+					"mean": (round(m.latency_sum_s / m.requests, 4) if m.requests else None),
+					"p50": m.latency_quantile(0.5),
+					"p90": m.latency_quantile(0.9),
+					"p99": m.latency_quantile(0.99),
+					"buckets": buckets,
+				},
+				"sleep_s": {"rate_limit": round(m.rate_limit_wait_s, 3), "backoff": round(m.backoff_s, 3)},
+			}
+		return out
+
+	def to_prometheus(self) -> str:
+		summary = self.summary()
+		lines = [
+			"# HELP gap_run_elapsed_seconds Seconds since the run started.",
+			"# TYPE gap_run_elapsed_seconds gauge",
+			f"gap_run_elapsed_seconds {summary['elapsed_s']}",
+		]
+		families: Dict[str, Tuple[str, str, List[str]]] = {
+			"duration": ("gap_http_request_duration_seconds", "histogram", []),
+			"responses": ("gap_http_responses_total", "counter", []),
+			"retries": ("gap_http_retries_total", "counter", []),
+			"errors": ("gap_http_transport_errors_total", "counter", []),
+			"bytes": ("gap_http_received_bytes_total", "counter", []),
+			"sleep": ("gap_http_sleep_seconds_total", "counter", []),
 		}
-	)
+		helps = {
+			"duration": "Latency of each HTTP attempt until response headers (or the full body when not streamed).",
+			"responses": "HTTP responses by status code.",
+			"retries": "Attempts beyond the first for a request.",
+			"errors": "Attempts that ended in a timeout or connection error.",
+			"bytes": "Response bytes received (Content-Length, or body size when not streamed).",
+			"sleep": "Seconds spent waiting before requests: rate limiter (incl. Retry-After) or retry backoff.",
+		}
+		for name, e in summary["endpoints"].items():
+			label = f'endpoint="{name}"'
+			metric = families["duration"][0]
+			for le, n in e["latency_s"]["buckets"].items():
+				families["duration"][2].append(f'{metric}_bucket{{{label},le="{le}"}} {n}')
+			families["duration"][2].append(f"{metric}_sum{{{label}}} {e['latency_s']['sum']}")
+			families["duration"][2].append(f"{metric}_count{{{label}}} {e['requests']}")
+			for status, n in sorted(e["statuses"].items()):
+				families["responses"][2].append(f'{families["responses"][0]}{{{label},status="{status}"}} {n}')
+			families["retries"][2].append(f"{families['retries'][0]}{{{label}}} {e['retries']}")
+			families["errors"][2].append(f"{families['errors'][0]}{{{label}}} {e['transport_errors']}")
+			families["bytes"][2].append(f"{families['bytes'][0]}{{{label}}} {e['bytes_received']}")
+			for reason, secs in e["sleep_s"].items():
+				families["sleep"][2].append(f'{families["sleep"][0]}{{{label},reason="{reason}"}} {secs}')
+		for key, (metric, kind, samples) in families.items():
+			lines.append(f"# HELP {metric} {helps[key]}")
+			lines.append(f"# TYPE {metric} {kind}")
+			lines.extend(samples)
+		return "\n".join(lines) + "\n"
+
+	def write(self, prefix: str) -> Tuple[str, str]:
+		"""Write ``<prefix>.json`` (summary) and ``<prefix>.prom`` (Prometheus text format)."""
+		json_path, prom_path = f"{prefix}.json", f"{prefix}.prom"
+		with open(json_path, "w", encoding="utf-8") as f:
+			json.dump(self.summary(), f, indent=2)
+		with open(prom_path, "w", encoding="utf-8") as f:
+			f.write(self.to_prometheus())
+		return json_path, prom_path
+
+	def print_summary(self) -> None:
+		summary = self.summary()
+		print(f"HTTP metrics after {summary['elapsed_s']:.1f}s:")
+		for name, e in summary["endpoints"].items():
+			lat = e["latency_s"]
+			p50 = "-" if lat["p50"] is None else f"{lat['p50']:.3f}s"
+			p99 = "-" if lat["p99"] is None else f"{lat['p99']:.3f}s"
+			print(
+				f"  {name}: {e['requests']} requests, {lat['sum']:.1f}s in flight (p50 {p50}, p99 {p99}), "
+				f"{e['retries']} retries, {e['bytes_received'] / 1e6:.1f} MB, "
+				f"slept {e['sleep_s']['rate_limit']:.1f}s rate-limited + {e['sleep_s']['backoff']:.1f}s backoff, "
+				f"statuses {e['statuses']}"
+			)
+
+
+def _serve_metrics(metrics: _HttpMetrics, port: int) -> ThreadingHTTPServer:
+	"""Serve ``/metrics`` (Prometheus text) and ``/metrics.json`` on localhost from a daemon thread."""
+
+	class Handler(BaseHTTPRequestHandler):
+		def log_message(self, *args: Any) -> None:
+			pass
+
+		def do_GET(self) -> None:
+			if self.path.startswith("/metrics.json"):
+				body, ctype = json.dumps(metrics.summary(), indent=2).encode(), "application/json"
+			elif self.path.startswith("/metrics"):
+				body, ctype = metrics.to_prometheus().encode(), "text/plain; version=0.0.4"
+			else:
+				self.send_error(404)
+				return
+			self.send_response(200)
+			self.send_header("Content-Type", ctype)
+			self.send_header("Content-Length", str(len(body)))
+			self.end_headers()
+			self.wfile.write(body)
+
+	server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+	server.daemon_threads = True
+	threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+	return server
+
+
+def _request_with_retry(
+	send: Callable[[], Any],
+	policy: RetryPolicy,
+	limiter: Optional[_AdaptiveRateLimiter] = None,
+	*,
+	metrics: Optional[_HttpMetrics] = None,
+	endpoint: str = "other",
+	stream: bool = False,
+) -> Any:
+	"""Run ``send()`` under ``policy``; the last response is returned even if it is still retryable."""
+	for attempt in range(1, policy.attempts + 1):
+		if limiter is not None:
+			waited = limiter.acquire()
+			if metrics is not None and waited:
+				metrics.add_sleep(endpoint, waited, reason="rate_limit")
+		if metrics is not None and attempt > 1:
+			metrics.add_retry(endpoint)
+		started = time.perf_counter()
+		try:
+			resp = send()
+		except (requests.Timeout, requests.ConnectionError):
+			if metrics is not None:
+				metrics.observe(endpoint, latency_s=time.perf_counter() - started, status=None)
+			if limiter is not None:
+				limiter.record(None)
+			if attempt == policy.attempts:
+				raise
+			delay = _backoff_s(policy, attempt)
+			if metrics is not None:
+				metrics.add_sleep(endpoint, delay, reason="backoff")
+			time.sleep(delay)
+			continue
+		if metrics is not None:
+			metrics.observe(
+				endpoint,
+				latency_s=time.perf_counter() - started,
+				status=resp.status_code,
+				nbytes=_response_bytes(resp, stream=stream),
+			)
+		retry_after = _retry_after_s(resp)
+		if retry_after is not None:
+			# The limiter pauses the whole host, so it gets the same cap as the local backoff.
+			retry_after = min(retry_after, policy.max_retry_after_s)
+		if limiter is not None:
+			limiter.record(resp.status_code, retry_after)
+		if resp.status_code in policy.statuses and attempt < policy.attempts:
+			delay = _backoff_s(policy, attempt, resp)
+			resp.close()
+			# With a limiter, Retry-After already holds back every request to this host.
+			if limiter is None or retry_after is None:
+				if metrics is not None:
+					metrics.add_sleep(endpoint, delay, reason="backoff")
+				time.sleep(delay)
+			continue
+		return resp
+	raise AssertionError("unreachable")
+
+
+class _RetryingSession(requests.Session):
+	"""``requests.Session`` that applies one ``RetryPolicy`` (and per-host rate limits) to every request."""
+
+	def __init__(
+		self,
+		retry_policy: RetryPolicy,
+		rate_limits: Optional[_HostRateLimits] = None,
+		metrics: Optional[_HttpMetrics] = None,
+	) -> None:
+		super().__init__()
+		self.retry_policy = retry_policy
+		self.rate_limits = rate_limits
+		self.metrics = metrics
+
+	def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+		parent = super().request
+		limiter = self.rate_limits.for_url(url) if self.rate_limits is not None else None
+		return _request_with_retry(
+			lambda: parent(method, url, *args, **kwargs),
+			self.retry_policy,
+			limiter,
+			metrics=self.metrics,
+			endpoint=_endpoint_for_url(url),
+			stream=bool(kwargs.get("stream")),
+		)
+
+
+def _requests_session(
+	pool_size: int = 10,
+	retry_policy: Optional[RetryPolicy] = None,
+	rate_limits: Optional[_HostRateLimits] = None,
+	metrics: Optional[_HttpMetrics] = None,
+) -> requests.Session:
+	session = _RetryingSession(retry_policy or RetryPolicy(), rate_limits, metrics)
+	# Size the per-host connection pool to the worker count so concurrent PowerReviews
+	# requests reuse connections instead of discarding them ("Connection pool is full").
+	adapter = HTTPAdapter(pool_connections=10, pool_maxsize=max(10, int(pool_size)))
+	session.mount("https://", adapter)
+	session.mount("http://", adapter)
+	session.headers.update(_BROWSER_HEADERS)
 	return session
 
 
+class _HttpxResponse:
+	"""The parts of ``requests.Response`` that gap.py uses, over an ``httpx.Response``."""
+
+	def __init__(self, resp: Any) -> None:
+		self._resp = resp
+		self.status_code = resp.status_code
+		self.headers = resp.headers
+		self.url = str(resp.url)
+
+	@property
+	def encoding(self) -> Optional[str]:
+		return self._resp.encoding
+
+	@property
+	def content(self) -> bytes:
+		return self._resp.read()
+
+	@property
+	def text(self) -> str:
+		self._resp.read()
+		return self._resp.text
+
+	def json(self) -> Any:
+		return json.loads(self.content)
+
+	def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+		return self._resp.iter_bytes(chunk_size)
+
+	def raise_for_status(self) -> None:
+		if self.status_code >= 400:
+			raise requests.HTTPError(f"HTTP {self.status_code} for url: {self.url}", response=self)
+
+	def close(self) -> None:
+		self._resp.close()
+
+	def __enter__(self) -> "_HttpxResponse":
+		return self
+
+	def __exit__(self, *exc: Any) -> None:
+		self.close()
+
+
+class _HttpxSession:
+	"""HTTP/2 client with the subset of the ``requests.Session`` API that gap.py calls."""
+
+	def __init__(
+		self,
+		*,
+		pool_size: int,
+		retry_policy: RetryPolicy,
+		rate_limits: Optional[_HostRateLimits] = None,
+		metrics: Optional[_HttpMetrics] = None,
+	) -> None:
+		try:
+			import httpx
+		except ImportError as e:
+			raise RuntimeError("--http2 needs httpx with HTTP/2 support: pip install 'httpx[http2]'") from e
+		self._httpx = httpx
+		self.retry_policy = retry_policy
+		self.rate_limits = rate_limits
+		self.metrics = metrics
+		self.headers: Dict[str, str] = dict(_BROWSER_HEADERS)
+		limits = httpx.Limits(max_connections=max(10, int(pool_size)), max_keepalive_connections=max(10, int(pool_size)))
+		self._client = httpx.Client(http2=True, limits=limits, follow_redirects=True)
+
+	def get(self, url: str, **kwargs: Any) -> _HttpxResponse:
+		return self.request("GET", url, **kwargs)
+
+	def request(
+		self,
+		method: str,
+		url: str,
+		*,
+		params: Optional[Dict[str, Any]] = None,
+		headers: Optional[Dict[str, str]] = None,
+		timeout: Optional[float] = None,
+		stream: bool = False,
+	) -> _HttpxResponse:
+		httpx = self._httpx
+
+		def send() -> _HttpxResponse:
+			request = self._client.build_request(
+				method,
+				url,
+				params=params,
+				headers={**self.headers, **(headers or {})},
+				timeout=timeout,
+			)
+			try:
+				return _HttpxResponse(self._client.send(request, stream=stream))
+			except httpx.TimeoutException as e:
+				raise requests.Timeout(str(e)) from e
+			except httpx.TransportError as e:
+				raise requests.ConnectionError(str(e)) from e
+
+		limiter = self.rate_limits.for_url(url) if self.rate_limits is not None else None
+		return _request_with_retry(
+			send,
+			self.retry_policy,
+			limiter,
+			metrics=self.metrics,
+			endpoint=_endpoint_for_url(url),
+			stream=stream,
+		)
+
+	def close(self) -> None:
+		self._client.close()
+
+
+def _make_session(
+	*,
+	pool_size: int,
+	retry_policy: RetryPolicy,
+	rate_limits: Optional[_HostRateLimits] = None,
+	http2: bool = False,
+	metrics: Optional[_HttpMetrics] = None,
+) -> Any:
+	if http2:
+		return _HttpxSession(pool_size=pool_size, retry_policy=retry_policy, rate_limits=rate_limits, metrics=metrics)
+	return _requests_session(pool_size=pool_size, retry_policy=retry_policy, rate_limits=rate_limits, metrics=metrics)
+
+
 def _safe_float(value: Any) -> Optional[float]:
 	if value is None:
 		return None
@@ -77,24 +696,15 @@ def _safe_int(value: Any) -> Optional[int]:
 		return None
 
 
-def _min_price_from_style_colors(style_colors: List[Dict[str, Any]]) -> Optional[float]:
-	prices: List[float] = []
-	for color in style_colors or []:
-		# Observed fields: effectivePrice, regularPrice
-		eff = _safe_float(color.get("effectivePrice"))
-		reg = _safe_float(color.get("regularPrice"))
-		if eff is not None:
-			prices.append(eff)
-		elif reg is not None:
-			prices.append(reg)
+def _min_price_from_style_colors(style_colors: Sequence[GapColor]) -> Optional[float]:
+	prices = [color.price for color in style_colors if color.price is not None]
 	return min(prices) if prices else None
 
 
-def _first_ccid(style_colors: List[Dict[str, Any]]) -> Optional[str]:
-	for color in style_colors or []:
-		ccid = color.get("ccId") or color.get("id")
-		if ccid:
-			return str(ccid)
+def _first_ccid(style_colors: Sequence[GapColor]) -> Optional[str]:
+	for color in style_colors:
+		if color.ccid:
+			return color.ccid
 	return None
 
 
@@ -138,6 +748,27 @@ def _price_from_style_color(style_color: Dict[str, Any]) -> Optional[float]:
 	return eff if eff is not None else reg
 
 
+def _gap_color_from_payload(color: Dict[str, Any]) -> GapColor:
+	pid = color.get("id") or color.get("ccId")
+	ccid = color.get("ccId") or color.get("id")
+	return GapColor(
+		pid=str(pid) if pid else None,
+		ccid=str(ccid) if ccid else None,
+		name=(color.get("ccName") or color.get("name") or "").strip(),
+		price=_price_from_style_color(color),
+	)
+
+
+def _gap_product_from_payload(product: Dict[str, Any]) -> GapProduct:
+	return GapProduct(
+		style_id=_style_id_from_product(product),
+		name=_style_name_from_product(product),
+		rating=_safe_float(product.get("reviewScore")),
+		review_count=_safe_int(product.get("reviewCount")),
+		colors=tuple(_gap_color_from_payload(c) for c in _colors_from_product(product) if isinstance(c, dict)),
+	)
+
+
 def _parse_params_from_gap_url(url: str) -> Dict[str, str]:
 	"""Extract query + fragment params from a Gap URL.
 
@@ -161,65 +792,91 @@ def _parse_params_from_gap_url(url: str) -> Dict[str, str]:
 	return out
 
 
+def _get_json_with_retry(
+	session: requests.Session,
+	url: str,
+	*,
+	params: Dict[str, Any],
+	headers: Dict[str, str],
+	attempts: int = 3,
+) -> Dict[str, Any]:
+	# Timeouts, connection errors and 429/5xx are retried by the session transport
+	# (RetryPolicy). Here we only retry bodies that fail to parse, e.g. a truncated response or
+	# an HTML error page served with 200.
+	policy = getattr(session, "retry_policy", None) or RetryPolicy()
+	metrics: Optional[_HttpMetrics] = getattr(session, "metrics", None)
+	for attempt in range(1, attempts + 1):
+		resp = session.get(url, params=params, headers=headers, timeout=30)
+		resp.raise_for_status()
+		try:
+			return resp.json()
+		except json.JSONDecodeError:
+			if attempt == attempts:
+				raise
+			delay = _backoff_s(policy, attempt)
+			if metrics is not None:
+				metrics.add_retry(_endpoint_for_url(url))
+				metrics.add_sleep(_endpoint_for_url(url), delay, reason="backoff")
+			time.sleep(delay)
+	raise AssertionError("unreachable")
+
+
 def fetch_gap_products(
 	*,
 	cid: Optional[str],
 	locale: str,
 	referer_url: str,
 	session: requests.Session,
-	page_sleep_s: float,
 	extra_params: Optional[Dict[str, str]] = None,
-) -> List[Dict[str, Any]]:
-	products: List[Dict[str, Any]] = []
-	page_number = 0
-	total_pages: Optional[int] = None
+	page_concurrency: int = 1,
+) -> Tuple[List[GapProduct], Dict[str, Any]]:
+	"""Fetch page 0, then the remaining pages concurrently; return ``(products, page0_meta)``."""
 	api_url = _gap_products_api_url(cid=cid, extra_params=extra_params)
 	use_style_api = api_url == GAP_PRODUCTS_STYLE_API
 
-	while True:
-		params: Dict[str, str] = {
-			"locale": locale,
-			"pageNumber": str(page_number),
-		}
-		# The style-search endpoint doesn't accept cid; it uses keyword-based search.
-		if cid and not use_style_api:
-			params["cid"] = str(cid)
-		# Ensure the API returns as many products per page as possible.
-		if use_style_api and "pageSize" not in params:
-			params["pageSize"] = "200"
-		if extra_params:
-			# Keep only values that the API is likely to accept; ignore anything empty.
-			for k, v in extra_params.items():
-				if k in {"cid", "locale", "pageNumber", "pageId"}:
-					continue
-				if v is None or str(v) == "":
-					continue
-				params[str(k)] = str(v)
-		headers = {"Referer": referer_url}
-		resp = session.get(api_url, params=params, headers=headers, timeout=30)
-		resp.raise_for_status()
-		data = resp.json()
-
-		if total_pages is None:
-			try:
-				total_pages = int(data.get("pagination", {}).get("pageNumberTotal"))
-			except Exception:
-				total_pages = 1
+	base_params: Dict[str, str] = {"locale": locale}
+	# The style-search endpoint doesn't accept cid; it uses keyword-based search.
+	if cid and not use_style_api:
+		base_params["cid"] = str(cid)
+	# Ensure the API returns as many products per page as possible.
+	if use_style_api:
+		base_params["pageSize"] = "200"
+	if extra_params:
+		# Keep only values that the API is likely to accept; ignore anything empty.
+		for k, v in extra_params.items():
+			if k in {"cid", "locale", "pageNumber", "pageId"}:
+				continue
+			if v is None or str(v) == "":
+				continue
+			base_params[str(k)] = str(v)
+	headers = {"Referer": referer_url}
 
-		batch = data.get("products") or []
+	def fetch_page(page_number: int) -> Tuple[List[GapProduct], Dict[str, Any]]:
+		data = _get_json_with_retry(
+			session,
+			api_url,
+			params={**base_params, "pageNumber": str(page_number)},
+			headers=headers,
+		)
+		batch = data.pop("products", None) or []
 		if not isinstance(batch, list):
 			raise RuntimeError("Unexpected products payload shape")
-		products.extend(batch)
+		return [_gap_product_from_payload(p) for p in batch if isinstance(p, dict)], data
 
-		page_number += 1
-		if total_pages is not None and page_number >= total_pages:
-			break
+	products, page0 = fetch_page(0)
+	try:
+		total_pages = int(page0.get("pagination", {}).get("pageNumberTotal"))
+	except Exception:
+		total_pages = 1
 
-		if page_sleep_s:
-			time.sleep(page_sleep_s)
+	if total_pages > 1:
+		with ThreadPoolExecutor(max_workers=max(1, int(page_concurrency)), thread_name_prefix="gap") as executor:
+			# map() yields in page order regardless of completion order.
+			for batch, _data in executor.map(fetch_page, range(1, total_pages)):
+				products.extend(batch)
 
-	# Return raw API rows; caller decides whether to de-dupe (style vs color granularity).
-	return products
+	# Caller decides whether to de-dupe (style vs color granularity).
+	return products, page0
 
 
 _POWERREVIEWS_CONFIG_RE = re.compile(
@@ -250,188 +907,1132 @@ def discover_powerreviews_config(
 	locale: str,
 ) -> PowerReviewsConfig:
 	# Pull config from PDP HTML; this avoids hard-coding merchant/apiKey.
+	# The blob usually sits well before the end of a multi-hundred-KB page, so the body is
+	# streamed and scanned chunk by chunk, and the download is dropped as soon as it matches.
 	url = f"{GAP_BASE}/browse/product.do?pid={sample_pid}"
-	resp = session.get(url, headers={"Accept": "text/html,*/*"}, timeout=30)
-	resp.raise_for_status()
-	html = resp.text
+	overlap = 4096  # longer than any powerReviewsConfig blob, so a match split across chunks is kept
+	cfg: Optional[PowerReviewsConfig] = None
+	with session.get(url, headers={"Accept": "text/html,*/*"}, timeout=30, stream=True) as resp:
+		resp.raise_for_status()
+		decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+		window = ""
+		for chunk in resp.iter_content(chunk_size=16384):
+			window = window[-overlap:] + decoder.decode(chunk)
+			cfg = _extract_powerreviews_config_from_html(window)
+			if cfg:
+				break
 
-	cfg = _extract_powerreviews_config_from_html(html)
 	if not cfg:
 		raise RuntimeError("Unable to find powerReviewsConfig on PDP")
 	return dataclasses.replace(cfg, locale=locale)
 
 
-def iter_powerreviews_reviews(
+def _load_pr_config_cache(path: str, *, locale: str, ttl_s: float) -> Optional[PowerReviewsConfig]:
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			data = json.load(f)
+	except Exception:
+		return None
+	rec = data.get(locale) if isinstance(data, dict) else None
+	if not isinstance(rec, dict):
+		return None
+	merchant_id = rec.get("merchant_id")
+	api_key = rec.get("api_key")
+	discovered_at = rec.get("discovered_at")
+	if not isinstance(merchant_id, str) or not isinstance(api_key, str) or not isinstance(discovered_at, (int, float)):
+		return None
+	if time.time() - discovered_at > ttl_s:
+		return None
+	return PowerReviewsConfig(merchant_id=merchant_id, api_key=api_key, locale=locale)
+
+
+def _save_pr_config_cache(path: str, cfg: PowerReviewsConfig) -> None:
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			data = json.load(f)
+		if not isinstance(data, dict):
+			data = {}
+	except Exception:
+		data = {}
+	data[cfg.locale] = {"merchant_id": cfg.merchant_id, "api_key": cfg.api_key, "discovered_at": time.time()}
+	tmp = f"{path}.tmp"
+	with open(tmp, "w", encoding="utf-8") as f:
+		json.dump(data, f)
+	os.replace(tmp, path)
+
+
+def _discard_pr_config_cache(path: str, *, locale: str) -> None:
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			data = json.load(f)
+	except Exception:
+		return
+	if not isinstance(data, dict) or data.pop(locale, None) is None:
+		return
+	tmp = f"{path}.tmp"
+	with open(tmp, "w", encoding="utf-8") as f:
+		json.dump(data, f)
+	os.replace(tmp, path)
+
+
+def _fetch_powerreviews_page(
 	*,
 	pr: PowerReviewsConfig,
 	style_id: str,
 	session: requests.Session,
-	request_sleep_s: float,
-) -> Iterable[Dict[str, Any]]:
-	base = f"https://display.powerreviews.com/m/{pr.merchant_id}/l/{pr.locale}/product/{style_id}/reviews"
+	paging_from: int,
+	paging_size: int,
+) -> Dict[str, Any]:
+	base = f"{POWERREVIEWS_BASE}/m/{pr.merchant_id}/l/{pr.locale}/product/{style_id}/reviews"
+	params = {
+		"apikey": pr.api_key,
+		"paging.from": paging_from,
+		"paging.size": paging_size,
+		"sort": "Newest",
+		"page_locale": pr.locale,
+	}
+	return _get_json_with_retry(session, base, params=params, headers={"Accept": "application/json"})
+
+
+def iter_powerreviews_pages(
+	*,
+	pr: PowerReviewsConfig,
+	style_id: str,
+	session: requests.Session,
+	page_concurrency: int = 1,
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+	"""Yield ``(paging.total_results, reviews)`` per page in offset order, newest reviews first."""
 	paging_from = 0
 	paging_size = 25  # enforced maximum
 
 	while True:
-		params = {
-			"apikey": pr.api_key,
-			"paging.from": paging_from,
-			"paging.size": paging_size,
-			"sort": "Newest",
-			"page_locale": pr.locale,
-		}
-		last_exc: Optional[BaseException] = None
-		for attempt in range(1, 6):
-			try:
-				resp = session.get(base, params=params, headers={"Accept": "application/json"}, timeout=30)
-				# Retry on rate limiting / transient server errors.
-				if resp.status_code in {429, 500, 502, 503, 504}:
-					raise requests.HTTPError(f"HTTP {resp.status_code}", response=resp)
-				resp.raise_for_status()
-				data = resp.json()
-				last_exc = None
-				break
-			except (requests.Timeout, requests.ConnectionError, requests.HTTPError, json.JSONDecodeError) as e:
-				last_exc = e
-				# Exponential backoff with a small floor.
-				sleep_s = min(10.0, 0.5 * (2 ** (attempt - 1)))
-				time.sleep(sleep_s)
-		if last_exc is not None:
-			raise last_exc
+		data = _fetch_powerreviews_page(
+			pr=pr,
+			style_id=style_id,
+			session=session,
+			paging_from=paging_from,
+			paging_size=paging_size,
+		)
 
 		paging = data.get("paging") or {}
 		total_results = int(paging.get("total_results") or 0)
-		results = data.get("results")
-		if not isinstance(results, list) or not results:
-			break
-		page = results[0]
-		reviews = page.get("reviews") or []
+		reviews = _reviews_from_powerreviews_page(data)
 		if not reviews:
 			break
 
-		for review in reviews:
-			yield review
+		yield total_results, reviews
 
 		paging_from += len(reviews)
 		if paging_from >= total_results:
 			break
 
-		if request_sleep_s:
-			time.sleep(request_sleep_s)
+		if page_concurrency > 1:
+			yield from _iter_powerreviews_pages_parallel(
+				pr=pr,
+				style_id=style_id,
+				session=session,
+				offsets=range(paging_from, total_results, paging_size),
+				paging_size=paging_size,
+				total_results=total_results,
+				page_concurrency=page_concurrency,
+			)
+			break
+
+
+def _reviews_from_powerreviews_page(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+	results = data.get("results")
+	if not isinstance(results, list) or not results:
+		return []
+	return results[0].get("reviews") or []
+
+
+def _iter_powerreviews_pages_parallel(
+	*,
+	pr: PowerReviewsConfig,
+	style_id: str,
+	session: requests.Session,
+	offsets: range,
+	paging_size: int,
+	total_results: int,
+	page_concurrency: int,
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+	def fetch(offset: int) -> List[Dict[str, Any]]:
+		data = _fetch_powerreviews_page(
+			pr=pr,
+			style_id=style_id,
+			session=session,
+			paging_from=offset,
+			paging_size=paging_size,
+		)
+		return _reviews_from_powerreviews_page(data)
+
+	# Sliding window: keep up to page_concurrency requests in flight and hand pages back in
+	# offset order, so an early stop by the consumer wastes at most one window of requests.
+	executor = ThreadPoolExecutor(max_workers=page_concurrency, thread_name_prefix=f"pr-{style_id}")
+	pending: List[Future] = []
+	next_offsets = iter(offsets)
+	try:
+		for offset in next_offsets:
+			pending.append(executor.submit(fetch, offset))
+			if len(pending) >= page_concurrency:
+				break
+		while pending:
+			reviews = pending.pop(0).result()
+			if not reviews:
+				break
+			yield total_results, reviews
+			for offset in next_offsets:
+				pending.append(executor.submit(fetch, offset))
+				break
+	finally:
+		executor.shutdown(wait=False, cancel_futures=True)
 
 
-def _load_pr_cache(path: str) -> Dict[str, Tuple[int, Dict[int, int], int]]:
+def iter_powerreviews_reviews(
+	*,
+	pr: PowerReviewsConfig,
+	style_id: str,
+	session: requests.Session,
+) -> Iterable[Dict[str, Any]]:
+	for _total_results, reviews in iter_powerreviews_pages(
+		pr=pr,
+		style_id=style_id,
+		session=session,
+	):
+		yield from reviews
+
+
+def _review_counts_from_record(rec: Any) -> Optional[ReviewCounts]:
+	"""Parse a cache record of any schema version (version 1 has no ``"v"`` and only 2020-2025)."""
+	if not isinstance(rec, dict):
+		return None
+	last12 = rec.get("last12")
+	years = rec.get("years", {})
+	total = rec.get("total")
+	if not isinstance(last12, int) or not isinstance(total, int) or not isinstance(years, dict):
+		return None
+	year_counts: Dict[int, int] = {}
+	for y, v in years.items():
+		if str(y).isdigit() and isinstance(v, int):
+			year_counts[int(y)] = v
+	# Watermark fields are optional; entries written before they existed are only carried forward
+	# by a refresh when no reviews were added since.
+	newest_ms = rec.get("newest_ms")
+	newest_id = rec.get("newest_id")
+	as_of_ms = rec.get("as_of_ms")
+	floor_ms = rec.get("timestamps_floor_ms")
+	timestamps = _decode_timestamps(rec.get("timestamps"))
+	months_rec = rec.get("months")
+	months: Optional[Dict[str, int]] = None
+	if isinstance(months_rec, dict):
+		months = {str(k): v for k, v in months_rec.items() if isinstance(v, int)}
+	elif timestamps is not None:
+		months = _month_counts_from_timestamps(timestamps)
+	gap_count = rec.get("gap_count")
+	return ReviewCounts(
+		last12=last12,
+		years=year_counts,
+		total=total,
+		newest_ms=newest_ms if isinstance(newest_ms, int) else None,
+		newest_id=newest_id if isinstance(newest_id, str) else None,
+		as_of_ms=as_of_ms if isinstance(as_of_ms, int) else None,
+		timestamps=timestamps,
+		timestamps_floor_ms=floor_ms if isinstance(floor_ms, int) else None,
+		months=months,
+		gap_review_count=gap_count if isinstance(gap_count, int) else None,
+	)
+
+
+def _record_is_current(rec: Any) -> bool:
+	return isinstance(rec, dict) and rec.get("v") == PR_CACHE_SCHEMA_VERSION
+
+
+def _review_counts_to_record(counts: ReviewCounts) -> Dict[str, Any]:
+	rec: Dict[str, Any] = {
+		"v": PR_CACHE_SCHEMA_VERSION,
+		"last12": int(counts.last12),
+		"total": int(counts.total),
+	}
+	if counts.years:
+		rec["years"] = {str(y): int(c) for y, c in counts.years.items()}
+	if counts.months is not None:
+		rec["months"] = {m: int(c) for m, c in sorted(counts.months.items())}
+	if counts.newest_ms is not None:
+		rec["newest_ms"] = int(counts.newest_ms)
+	if counts.newest_id is not None:
+		rec["newest_id"] = str(counts.newest_id)
+	if counts.as_of_ms is not None:
+		rec["as_of_ms"] = int(counts.as_of_ms)
+	if counts.timestamps is not None:
+		rec["timestamps"] = _encode_timestamps(counts.timestamps)
+		if counts.timestamps_floor_ms is not None:
+			rec["timestamps_floor_ms"] = int(counts.timestamps_floor_ms)
+	if counts.gap_review_count is not None:
+		rec["gap_count"] = int(counts.gap_review_count)
+	return rec
+
+
+def _encode_timestamps(timestamps: np.ndarray) -> str:
+	# Sorted timestamps have small gaps, so deltas compress far better than raw epoch values.
+	deltas = np.diff(np.asarray(timestamps, dtype="<i8"), prepend=np.int64(0))
+	return base64.b64encode(zlib.compress(deltas.astype("<i8").tobytes())).decode("ascii")
+
+
+def _decode_timestamps(value: Any) -> Optional[np.ndarray]:
+	if not isinstance(value, str):
+		return None
+	try:
+		deltas = np.frombuffer(zlib.decompress(base64.b64decode(value)), dtype="<i8")
+	except Exception:
+		return None
+	return np.cumsum(deltas).astype(np.int64)
+
+
+def _load_pr_cache(path: str) -> Tuple[Dict[str, ReviewCounts], int]:
+	"""Return ``(entries, upgraded)``: the parsed cache and how many records were an older schema."""
 	try:
 		with open(path, "r", encoding="utf-8") as f:
 			data = json.load(f)
 	except FileNotFoundError:
-		return {}
+		return {}, 0
 	except Exception:
-		return {}
+		return {}, 0
 	if not isinstance(data, dict):
-		return {}
-	out: Dict[str, Tuple[int, Dict[int, int], int]] = {}
+		return {}, 0
+	out: Dict[str, ReviewCounts] = {}
+	upgraded = 0
 	for style_id, rec in data.items():
-		if not isinstance(style_id, str) or not isinstance(rec, dict):
+		if not isinstance(style_id, str):
 			continue
-		last12 = rec.get("last12")
-		years = rec.get("years")
-		total = rec.get("total")
-		if not isinstance(last12, int) or not isinstance(total, int) or not isinstance(years, dict):
-			continue
-		year_counts: Dict[int, int] = {}
-		ok = True
-		for y in (2020, 2021, 2022, 2023, 2024, 2025):
-			v = years.get(str(y)) if str(y) in years else years.get(y)
-			if not isinstance(v, int):
-				ok = False
-				break
-			year_counts[y] = v
-		if not ok:
-			continue
-		out[style_id] = (last12, year_counts, total)
-	return out
+		counts = _review_counts_from_record(rec)
+		if counts is not None:
+			out[style_id] = counts
+			upgraded += not _record_is_current(rec)
+	return out, upgraded
 
 
-def _save_pr_cache(path: str, cache: Dict[str, Tuple[int, Dict[int, int], int]]) -> None:
+def _save_pr_cache(path: str, cache: Dict[str, ReviewCounts]) -> None:
 	# Atomic-ish write to avoid corrupting cache on interruption.
 	tmp = f"{path}.tmp"
-	data: Dict[str, Any] = {}
-	for style_id, (last12, year_counts, total) in cache.items():
-		data[style_id] = {
-			"last12": int(last12),
-			"total": int(total),
-			"years": {str(y): int(c) for y, c in year_counts.items()},
-		}
+	data = {style_id: _review_counts_to_record(counts) for style_id, counts in cache.items()}
 	with open(tmp, "w", encoding="utf-8") as f:
 		json.dump(data, f)
 	os.replace(tmp, path)
 
 
+class _JsonPRCache:
+	"""PowerReviews cache held in memory and mirrored to one JSON file, saved at most every ``save_interval_s``."""
+
+	def __init__(self, path: Optional[str], *, save_interval_s: float = 5.0) -> None:
+		self._path = path
+		self._save_interval_s = save_interval_s
+		self._lock = threading.Lock()
+		self._data: Dict[str, ReviewCounts] = {}
+		upgraded = 0
+		if path:
+			self._data, upgraded = _load_pr_cache(path)
+		# Older-schema entries were upgraded while loading; the next save rewrites them.
+		self._dirty = upgraded > 0
+		self._last_save = time.monotonic()
+
+	def get(self, style_id: str) -> Optional[ReviewCounts]:
+		with self._lock:
+			return self._data.get(style_id)
+
+	def put(self, style_id: str, counts: ReviewCounts) -> None:
+		with self._lock:
+			self._data[style_id] = counts
+			self._dirty = True
+			if time.monotonic() - self._last_save >= self._save_interval_s:
+				self._flush_locked()
+
+	def close(self) -> None:
+		with self._lock:
+			self._flush_locked()
+
+	def _flush_locked(self) -> None:
+		if self._path and self._dirty:
+			_save_pr_cache(self._path, self._data)
+		self._dirty = False
+		self._last_save = time.monotonic()
+
+
+class _SqlitePRCache:
+	"""PowerReviews cache in SQLite (WAL mode), read on demand and upserted per style."""
+
+	def __init__(self, path: str) -> None:
+		self._path = path
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+		self._conn.execute("PRAGMA journal_mode=WAL")
+		self._conn.execute("PRAGMA synchronous=NORMAL")
+		self._conn.execute(
+			"CREATE TABLE IF NOT EXISTS review_counts ("
+			"style_id TEXT PRIMARY KEY, record TEXT NOT NULL, updated_at INTEGER NOT NULL)"
+		)
+
+	def get(self, style_id: str) -> Optional[ReviewCounts]:
+		with self._lock:
+			row = self._conn.execute("SELECT record FROM review_counts WHERE style_id = ?", (style_id,)).fetchone()
+		if row is None:
+			return None
+		try:
+			rec = json.loads(row[0])
+		except json.JSONDecodeError:
+			return None
+		counts = _review_counts_from_record(rec)
+		if counts is not None and not _record_is_current(rec):
+			# Upgrade older-schema rows in place the first time they are read.
+			self.put(style_id, counts)
+		return counts
+
+	def put(self, style_id: str, counts: ReviewCounts) -> None:
+		record = json.dumps(_review_counts_to_record(counts))
+		with self._lock:
+			self._conn.execute(
+				"INSERT INTO review_counts (style_id, record, updated_at) VALUES (?, ?, ?) "
+				"ON CONFLICT(style_id) DO UPDATE SET record = excluded.record, updated_at = excluded.updated_at",
+				(style_id, record, int(time.time())),
+			)
+
+	def close(self) -> None:
+		with self._lock:
+			self._conn.close()
+
+
+def _open_pr_cache(path: Optional[str], backend: str = "auto") -> Any:
+	if backend not in {"auto", "json", "sqlite"}:
+		raise ValueError("pr cache backend must be one of: auto, json, sqlite")
+	if path and (backend == "sqlite" or (backend == "auto" and path.lower().endswith((".sqlite", ".sqlite3", ".db")))):
+		return _SqlitePRCache(path)
+	return _JsonPRCache(path)
+
+
+def _to_ms(dt: datetime) -> int:
+	return int(dt.timestamp() * 1000)
+
+
+def _review_created_ms(review: Dict[str, Any]) -> Optional[int]:
+	details = review.get("details") or {}
+	try:
+		return int(details["created_date"])
+	except Exception:
+		return None
+
+
+def _review_id(review: Dict[str, Any]) -> Optional[str]:
+	value = review.get("review_id")
+	if value is None:
+		value = review.get("ugc_id")
+	if value is None:
+		return None
+	return str(value)
+
+
+def _default_years(now_utc: datetime) -> Tuple[int, ...]:
+	return tuple(range(DEFAULT_FIRST_YEAR, now_utc.year + 1))
+
+
+def _year_start_ms(year: int) -> int:
+	return _to_ms(datetime(year, 1, 1, tzinfo=timezone.utc))
+
+
+def _month_counts_from_timestamps(timestamps: np.ndarray) -> Dict[str, int]:
+	months, counts = np.unique(timestamps.astype("datetime64[ms]").astype("datetime64[M]"), return_counts=True)
+	return {str(m): int(c) for m, c in zip(months, counts)}
+
+
+def _year_values(counts: ReviewCounts, years: Sequence[int]) -> Dict[int, Optional[int]]:
+	"""Per-year counts for ``years``, or None for a year the entry cannot answer."""
+	by_year: Dict[int, int] = {}
+	for month, n in (counts.months or {}).items():
+		by_year[int(month[:4])] = by_year.get(int(month[:4]), 0) + n
+	floor_ms = counts.timestamps_floor_ms
+	out: Dict[int, Optional[int]] = {}
+	for y in years:
+		if counts.months is not None and (floor_ms is None or floor_ms <= _year_start_ms(y)):
+			out[y] = by_year.get(y, 0)
+		elif y in counts.years:
+			out[y] = counts.years[y]
+		elif counts.newest_ms is not None and _year_start_ms(y) > counts.newest_ms:
+			# The year began after the entry's newest review.
+			out[y] = 0
+		elif counts.total == 0:
+			out[y] = 0
+		else:
+			out[y] = None
+	return out
+
+
+def _count_in_windows(timestamps: np.ndarray, starts_ms: Sequence[int], ends_ms: Sequence[int]) -> np.ndarray:
+	"""Count sorted ``timestamps`` falling in each ``[start, end)`` window, all windows at once."""
+	starts = np.searchsorted(timestamps, np.asarray(starts_ms, dtype=np.int64), side="left")
+	ends = np.searchsorted(timestamps, np.asarray(ends_ms, dtype=np.int64), side="left")
+	return ends - starts
+
+
+def _timestamps_from_reviews(reviews: List[Dict[str, Any]]) -> np.ndarray:
+	# Reviews without a created_date still count towards the total but have no timestamp.
+	created = (_review_created_ms(r) for r in reviews)
+	return np.fromiter((c for c in created if c is not None), dtype=np.int64)
+
+
+def parse_bucket_spec(spec: str, *, now_utc: datetime) -> List[ReviewBucket]:
+	"""Turn a ``--bucket`` spec (``2024``, ``2025-03``, ``months:2025``, ``last90d``, ``a..b``) into UTC windows."""
+	spec = spec.strip()
+
+	def day(value: str) -> datetime:
+		return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+	def month_bucket(year: int, month: int) -> ReviewBucket:
+		start = datetime(year, month, 1, tzinfo=timezone.utc)
+		end = datetime(year + (month == 12), month % 12 + 1, 1, tzinfo=timezone.utc)
+		return ReviewBucket(label=f"{year:04d}-{month:02d}", start_ms=_to_ms(start), end_ms=_to_ms(end))
+
+	m = re.fullmatch(r"last(\d+)d", spec)
+	if m:
+		start = now_utc - timedelta(days=int(m.group(1)))
+		return [ReviewBucket(label=spec, start_ms=_to_ms(start), end_ms=_to_ms(now_utc) + 1)]
+	m = re.fullmatch(r"months:(\d{4})", spec)
+	if m:
+		return [month_bucket(int(m.group(1)), month) for month in range(1, 13)]
+	m = re.fullmatch(r"(\d{4})-(\d{2})", spec)
+	if m:
+		return [month_bucket(int(m.group(1)), int(m.group(2)))]
+	m = re.fullmatch(r"(\d{4})", spec)
+	if m:
+		year = int(m.group(1))
+		start = datetime(year, 1, 1, tzinfo=timezone.utc)
+		end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+		return [ReviewBucket(label=spec, start_ms=_to_ms(start), end_ms=_to_ms(end))]
+	m = re.fullmatch(r"(\d{4}-\d{2}-\d{2})\.\.(\d{4}-\d{2}-\d{2})", spec)
+	if m:
+		return [ReviewBucket(label=spec, start_ms=_to_ms(day(m.group(1))), end_ms=_to_ms(day(m.group(2))))]
+	raise ValueError(f"Unrecognised --bucket spec: {spec!r}")
+
+
+def _review_values(
+	counts: ReviewCounts,
+	*,
+	now_utc: datetime,
+	buckets: Sequence[ReviewBucket],
+	years: Sequence[int],
+) -> Tuple[int, Dict[int, Optional[int]], Dict[str, Optional[int]]]:
+	"""Return ``(last12, year_counts, bucket_counts)`` for a row, as of ``now_utc``."""
+	ts = counts.timestamps
+	year_counts = _year_values(counts, years)
+	if ts is None:
+		return counts.last12, year_counts, {b.label: None for b in buckets}
+
+	last12_start_ms = _to_ms(now_utc - timedelta(days=365))
+	floor_ms = counts.timestamps_floor_ms
+	last12 = counts.last12
+	if floor_ms is None or floor_ms <= last12_start_ms:
+		last12 = int(len(ts) - np.searchsorted(ts, last12_start_ms, side="left"))
+
+	bucket_counts: Dict[str, Optional[int]] = {}
+	if buckets:
+		windows = _count_in_windows(ts, [b.start_ms for b in buckets], [b.end_ms for b in buckets])
+		for b, n in zip(buckets, windows):
+			complete = floor_ms is None or b.start_ms >= floor_ms
+			bucket_counts[b.label] = int(n) if complete else None
+	return last12, year_counts, bucket_counts
+
+
 def compute_review_counts(
 	*,
 	pr: PowerReviewsConfig,
 	style_id: str,
 	session: requests.Session,
 	now_utc: datetime,
-	request_sleep_s: float,
-) -> Tuple[int, Dict[int, int], int]:
+	page_concurrency: int = 1,
+	history_floor: Optional[datetime] = None,
+	years: Optional[Sequence[int]] = None,
+) -> ReviewCounts:
 	last12_start = now_utc - timedelta(days=365)
-	year_counts = {2020: 0, 2021: 0, 2022: 0, 2023: 0, 2024: 0, 2025: 0}
-	last12 = 0
-	total = 0
-
-	for review in iter_powerreviews_reviews(
+	years = years or _default_years(now_utc)
+	total: Optional[int] = None
+	seen = 0
+	newest_ms: Optional[int] = None
+	newest_id: Optional[str] = None
+	page_timestamps: List[np.ndarray] = []
+
+	# Reviews arrive newest first, so once one predates every bucket we track (earliest year, the
+	# 12-month window and any extra --bucket windows) nothing further can be counted and we stop.
+	earliest = min(datetime(min(years), 1, 1, tzinfo=timezone.utc), last12_start)
+	if history_floor is not None:
+		earliest = min(earliest, history_floor)
+	cutoff_ms = _to_ms(earliest)
+	reached_cutoff = False
+
+	pages = iter_powerreviews_pages(
 		pr=pr,
 		style_id=style_id,
 		session=session,
-		request_sleep_s=request_sleep_s,
-	):
-		total += 1
-		details = review.get("details") or {}
-		created_ms = details.get("created_date")
-		if created_ms is None:
+		page_concurrency=page_concurrency,
+	)
+	for total_results, reviews in pages:
+		if total is None:
+			# Take the total from the first page's paging block rather than counting every review.
+			total = total_results
+			newest_ms = _review_created_ms(reviews[0])
+			newest_id = _review_id(reviews[0])
+		seen += len(reviews)
+		ts = _timestamps_from_reviews(reviews)
+		older = np.flatnonzero(ts < cutoff_ms)
+		if older.size:
+			page_timestamps.append(ts[: older[0]])
+			reached_cutoff = True
+			break
+		page_timestamps.append(ts)
+
+	timestamps = np.sort(np.concatenate(page_timestamps)) if page_timestamps else np.empty(0, dtype=np.int64)
+	last12 = int(len(timestamps) - np.searchsorted(timestamps, _to_ms(last12_start), side="left"))
+	return ReviewCounts(
+		last12=last12,
+		years={},
+		total=max(total or 0, seen),
+		newest_ms=newest_ms,
+		newest_id=newest_id,
+		as_of_ms=_to_ms(now_utc),
+		timestamps=timestamps,
+		timestamps_floor_ms=(cutoff_ms if reached_cutoff else None),
+		months=_month_counts_from_timestamps(timestamps),
+	)
+
+
+class _PowerReviewsOffsets:
+	"""Random-access view of one style's reviews (newest first) that never fetches an offset twice."""
+
+	paging_size = 25  # enforced maximum
+
+	def __init__(
+		self,
+		*,
+		pr: PowerReviewsConfig,
+		style_id: str,
+		session: requests.Session,
+	) -> None:
+		self._pr = pr
+		self._style_id = style_id
+		self._session = session
+		self.created: Dict[int, Optional[int]] = {}
+		self.ids: Dict[int, Optional[str]] = {}
+		self.total = 0
+
+	def load(self, paging_from: int, size: int) -> int:
+		data = _fetch_powerreviews_page(
+			pr=self._pr,
+			style_id=self._style_id,
+			session=self._session,
+			paging_from=paging_from,
+			paging_size=size,
+		)
+		reviews = _reviews_from_powerreviews_page(data)
+		for offset, review in enumerate(reviews, start=paging_from):
+			self.created[offset] = _review_created_ms(review)
+			self.ids[offset] = _review_id(review)
+		paging = data.get("paging") or {}
+		self.total = int(paging.get("total_results") or 0)
+		return len(reviews)
+
+	def count_since(self, boundary_ms: int, lo: int, hi: int) -> int:
+		"""Number of reviews created at or after ``boundary_ms``, searching offsets ``[lo, hi)``."""
+		# Reviews without a created_date are treated as newer than the boundary.
+		if self.created.get(lo) is not None and self.created[lo] < boundary_ms:
+			return lo
+		while lo < hi:
+			if hi - lo <= self.paging_size and any(o not in self.created for o in range(lo, hi)):
+				self.load(lo, hi - lo)
+			mid = (lo + hi) // 2
+			if mid not in self.created:
+				self.load(mid, 1)
+			if mid not in self.created:
+				# The listing shrank underneath us; treat the rest as missing.
+				return mid
+			created_ms = self.created[mid]
+			if created_ms is not None and created_ms < boundary_ms:
+				hi = mid
+			else:
+				lo = mid + 1
+		return lo
+
+
+def compute_review_counts_bisect(
+	*,
+	pr: PowerReviewsConfig,
+	style_id: str,
+	session: requests.Session,
+	now_utc: datetime,
+	years: Optional[Sequence[int]] = None,
+) -> ReviewCounts:
+	"""Same counts as ``compute_review_counts``, found by bisecting the offset of each year boundary."""
+	last12_start = now_utc - timedelta(days=365)
+	year_counts = {y: 0 for y in sorted(years or _default_years(now_utc))}
+	offsets = _PowerReviewsOffsets(pr=pr, style_id=style_id, session=session)
+
+	offsets.load(0, offsets.paging_size)
+	total = offsets.total
+	if total <= 0 or 0 not in offsets.created:
+		return ReviewCounts(last12=0, years=year_counts, total=0, as_of_ms=_to_ms(now_utc))
+
+	years = sorted(year_counts)
+	boundaries = {y: _to_ms(datetime(y, 1, 1, tzinfo=timezone.utc)) for y in years + [years[-1] + 1]}
+	boundaries_desc = sorted([*boundaries.values(), _to_ms(last12_start)], reverse=True)
+
+	# Older boundaries can only have larger counts, so each search starts where the last ended.
+	since: Dict[int, int] = {}
+	lo = 0
+	for boundary_ms in boundaries_desc:
+		lo = offsets.count_since(boundary_ms, lo, total)
+		since[boundary_ms] = lo
+
+	for y in years:
+		year_counts[y] = since[boundaries[y]] - since[boundaries[y + 1]]
+	return ReviewCounts(
+		last12=since[_to_ms(last12_start)],
+		years=year_counts,
+		total=total,
+		newest_ms=offsets.created[0],
+		newest_id=offsets.ids[0],
+		as_of_ms=_to_ms(now_utc),
+	)
+
+
+def refresh_review_counts(
+	*,
+	pr: PowerReviewsConfig,
+	style_id: str,
+	session: requests.Session,
+	now_utc: datetime,
+	previous: ReviewCounts,
+	years: Sequence[int] = (),
+	history_floor_ms: Optional[int] = None,
+) -> Optional[ReviewCounts]:
+	"""Bring cached counts up to date from the reviews newer than the watermark; None means recompute."""
+	last12_start = now_utc - timedelta(days=365)
+	year_counts = dict(previous.years)
+	months = dict(previous.months) if previous.months is not None else None
+	offsets = _PowerReviewsOffsets(pr=pr, style_id=style_id, session=session)
+	offsets.load(0, offsets.paging_size)
+	if previous.newest_ms is None and offsets.total != previous.total:
+		# Without a watermark the entry can only be carried forward when nothing was added.
+		return None
+
+	new_reviews = 0
+	new_timestamps: List[int] = []
+	offset = 0
+	while previous.newest_ms is not None and offset < offsets.total:
+		if offset not in offsets.created and offsets.load(offset, offsets.paging_size) == 0:
+			break
+		created_ms = offsets.created[offset]
+		if previous.newest_id is not None and offsets.ids[offset] == previous.newest_id:
+			break
+		if created_ms is not None and created_ms < previous.newest_ms:
+			break
+		new_reviews += 1
+		if created_ms is not None:
+			new_timestamps.append(created_ms)
+			created = datetime.fromtimestamp(created_ms / 1000, tz=timezone.utc)
+			if months is not None:
+				month = f"{created.year:04d}-{created.month:02d}"
+				months[month] = months.get(month, 0) + 1
+			if created.year in year_counts:
+				year_counts[created.year] += 1
+			elif year_counts and _year_start_ms(created.year) > previous.newest_ms:
+				# A year that began after the previous newest review: every review in it is new.
+				year_counts[created.year] = 1
+		offset += 1
+
+	if previous.total + new_reviews != offsets.total:
+		return None
+
+	last12_start_ms = _to_ms(last12_start)
+	timestamps = previous.timestamps
+	floor_ms = previous.timestamps_floor_ms
+	if timestamps is not None:
+		timestamps = np.sort(np.concatenate([timestamps, np.asarray(new_timestamps, dtype=np.int64)]))
+	if offsets.total <= 0:
+		last12 = 0
+	elif timestamps is not None and (floor_ms is None or floor_ms <= last12_start_ms):
+		last12 = int(len(timestamps) - np.searchsorted(timestamps, last12_start_ms, side="left"))
+	else:
+		last12 = offsets.count_since(last12_start_ms, 0, offsets.total)
+	if _history_too_shallow(previous, history_floor_ms) and timestamps is not None and floor_ms is not None:
+		# A --bucket reaches back past the stored history: walk on from the first review older than
+		# the old floor down to the new one.
+		older: List[int] = []
+		offset = offsets.count_since(floor_ms, 0, offsets.total)
+		floor_ms = None
+		while offset < offsets.total:
+			if offset not in offsets.created and offsets.load(offset, offsets.paging_size) == 0:
+				break
+			created_ms = offsets.created[offset]
+			if created_ms is not None and created_ms < history_floor_ms:
+				floor_ms = history_floor_ms
+				break
+			if created_ms is not None:
+				older.append(created_ms)
+			offset += 1
+		timestamps = np.sort(np.concatenate([timestamps, np.asarray(older, dtype=np.int64)]))
+		months = _month_counts_from_timestamps(timestamps)
+	counts = ReviewCounts(
+		last12=last12,
+		years=year_counts,
+		total=offsets.total,
+		newest_ms=offsets.created.get(0),
+		newest_id=offsets.ids.get(0),
+		as_of_ms=_to_ms(now_utc),
+		timestamps=timestamps,
+		timestamps_floor_ms=floor_ms,
+		months=months,
+	)
+	# Years the entry never tracked (e.g. one added since a version-1 entry) are bisected.
+	missing = [y for y, v in _year_values(counts, years).items() if v is None]
+	if not missing:
+		return counts
+	boundaries_desc = sorted({_year_start_ms(y + d) for y in missing for d in (0, 1)}, reverse=True)
+	since: Dict[int, int] = {}
+	lo = 0
+	for boundary_ms in boundaries_desc:
+		lo = offsets.count_since(boundary_ms, lo, offsets.total)
+		since[boundary_ms] = lo
+	for y in missing:
+		year_counts[y] = since[_year_start_ms(y)] - since[_year_start_ms(y + 1)]
+	return dataclasses.replace(counts, years=year_counts)
+
+
+def _history_too_shallow(counts: ReviewCounts, history_floor_ms: Optional[int]) -> bool:
+	# Stored timestamps stop short of the earliest --bucket window, whose cells would stay blank.
+	floor_ms = counts.timestamps_floor_ms
+	return (
+		history_floor_ms is not None
+		and counts.timestamps is not None
+		and floor_ms is not None
+		and history_floor_ms < floor_ms
+	)
+
+
+def _empty_review_counts(now_utc: datetime) -> ReviewCounts:
+	timestamps = np.empty(0, dtype=np.int64)
+	return ReviewCounts(
+		last12=0,
+		years={},
+		total=0,
+		as_of_ms=_to_ms(now_utc),
+		timestamps=timestamps,
+		months={},
+	)
+
+
+# Assumed PowerReviews round trip, used by --plan to turn request counts into wall time.
+_PLAN_REQUEST_S = 0.35
+
+
+@dataclass(frozen=True)
+class _ReviewWorkItem:
+	style_id: str
+	review_count: Optional[int]
+	requests: int
+
+
+@dataclass(frozen=True)
+class _ReviewWorkPlan:
+	items: List[_ReviewWorkItem]  # styles to fetch, heaviest first
+	empty: List[str]  # Gap reports no reviews, so no requests are made
+	cached: List[str]  # reused from the cache as-is
+
+	@property
+	def total_requests(self) -> int:
+		return sum(item.requests for item in self.items)
+
+
+def _estimate_review_requests(
+	review_count: Optional[int],
+	*,
+	bisect: bool,
+	refresh: bool,
+	years: Sequence[int],
+	missing_years: Sequence[int] = (),
+	deepen: bool = False,
+) -> int:
+	pages = max(1, -(-review_count // 25)) if review_count else 1
+	if refresh:
+		# A refresh usually stops on the first page, at the previous watermark; years the entry
+		# never tracked cost a binary search per Jan 1st boundary, and deepening the stored history
+		# one more search plus at least a page.
+		boundaries = len({y + d for y in missing_years for d in (0, 1)}) + int(deepen)
+		return 1 + boundaries * (pages - 1).bit_length() + int(deepen)
+	if bisect and pages > 1:
+		# One first page, then a binary search per boundary: every Jan 1st in ``years``, the
+		# Jan 1st after the last one, and the 12-month window start.
+		return 1 + (len(years) + 2) * (pages - 1).bit_length()
+	return pages
+
+
+def _plan_review_work(
+	styles: Iterable[Tuple[Optional[str], Optional[int]]],
+	*,
+	cache: Any,
+	bisect: bool,
+	refresh: bool,
+	expires_before_ms: Optional[int] = None,
+	years: Sequence[int] = (),
+	history_floor_ms: Optional[int] = None,
+) -> _ReviewWorkPlan:
+	"""Cost each ``(style_id, gap_review_count)`` in PowerReviews requests; up-to-date cached styles are skipped."""
+	items: List[_ReviewWorkItem] = []
+	empty: List[str] = []
+	cached: List[str] = []
+	seen: set[str] = set()
+	for style_id, review_count in styles:
+		if not style_id or style_id in seen:
+			continue
+		seen.add(style_id)
+		if review_count == 0:
+			empty.append(style_id)
 			continue
+		previous = cache.get(style_id)
+		is_cached = previous is not None
+		missing = [y for y, v in _year_values(previous, years).items() if v is None] if is_cached else []
+		deepen = is_cached and _history_too_shallow(previous, history_floor_ms)
+		if is_cached and not refresh and not missing and not deepen:
+			# Entries written before the reviewCount was stored count as changed.
+			changed = review_count is None or previous.gap_review_count != review_count
+			expired = expires_before_ms is not None and (previous.as_of_ms or 0) < expires_before_ms
+			if not changed and not expired:
+				cached.append(style_id)
+				continue
+		requests_ = _estimate_review_requests(
+			review_count, bisect=bisect, refresh=is_cached, years=years, missing_years=missing, deepen=deepen
+		)
+		items.append(_ReviewWorkItem(style_id=style_id, review_count=review_count, requests=requests_))
+	# Heaviest first (LPT), so the biggest style does not become the tail of the run. sorted() is
+	# stable, so equal-cost styles keep listing order.
+	items = sorted(items, key=lambda item: item.requests, reverse=True)
+	return _ReviewWorkPlan(items=items, empty=empty, cached=cached)
 
+
+def _estimate_plan_wall_s(
+	plan: _ReviewWorkPlan,
+	*,
+	concurrency: int,
+	page_concurrency: int,
+	rate: Optional[float] = None,
+) -> float:
+	# LPT makespan: each style goes to the worker that frees up first.
+	workers = [0.0] * max(1, int(concurrency))
+	for item in plan.items:
+		rounds = 1 + -(-(item.requests - 1) // max(1, int(page_concurrency)))
+		heapq.heappush(workers, heapq.heappop(workers) + rounds * _PLAN_REQUEST_S)
+	# All workers share one PowerReviews rate limit, which may be the tighter bound.
+	return max(max(workers), plan.total_requests / rate if rate else 0.0)
+
+
+def _print_plan(
+	plan: _ReviewWorkPlan,
+	*,
+	concurrency: int,
+	page_concurrency: int,
+	rate: Optional[float] = None,
+) -> None:
+	wall_s = _estimate_plan_wall_s(plan, concurrency=concurrency, page_concurrency=page_concurrency, rate=rate)
+	pace = f" and {rate:g} req/s" if rate else ""
+	print(
+		f"PowerReviews plan: {len(plan.items)} styles to fetch, {len(plan.cached)} cached, "
+		f"{len(plan.empty)} with no reviews skipped; ~{plan.total_requests} requests, "
+		f"~{wall_s:.0f}s at {concurrency} workers{pace}"
+	)
+	for item in plan.items[:5]:
+		print(f"  style {item.style_id}: reviewCount={item.review_count} ~{item.requests} requests")
+
+
+class _ReviewCountPool:
+	"""Bounded worker pool for PowerReviews counts; ``result()`` reads them back in row order."""
+
+	def __init__(
+		self,
+		*,
+		pr: PowerReviewsConfig,
+		session: requests.Session,
+		now_utc: datetime,
+		cache: Any,
+		concurrency: int,
+		page_concurrency: int = 1,
+		bisect: bool = False,
+		refresh: bool = False,
+		history_floor: Optional[datetime] = None,
+		years: Optional[Sequence[int]] = None,
+		rediscover_pr: Optional[Callable[[], PowerReviewsConfig]] = None,
+	) -> None:
+		self._pr = pr
+		# Called at most once, when PowerReviews rejects ``pr`` (a cached config gone stale).
+		self._rediscover_pr = rediscover_pr
+		self._pr_lock = threading.Lock()
+		self._session = session
+		self._now_utc = now_utc
+		self._cache = cache
+		self._page_concurrency = page_concurrency
+		self._bisect = bisect
+		self._refresh = refresh
+		self._history_floor = history_floor
+		self._years = tuple(years or _default_years(now_utc))
+		self._futures: Dict[str, Future] = {}
+		self._empty: set[str] = set()
+		self._gap_counts: Dict[str, Optional[int]] = {}
+		# result() calls still to come per style; a finished future is dropped after the last one.
+		self._reads_left: Dict[str, int] = {}
+		self._executor = ThreadPoolExecutor(max_workers=max(1, int(concurrency)), thread_name_prefix="pr")
+
+	def submit_plan(self, plan: _ReviewWorkPlan) -> None:
+		self._empty.update(plan.empty)
+		self._gap_counts.update((item.style_id, item.review_count) for item in plan.items)
+		# The executor queue is FIFO, so submitting heaviest first makes the workers run LPT.
+		# Planned items are computed even when cached: the plan has decided they are stale.
+		for item in plan.items:
+			if item.style_id not in self._futures:
+				previous = self._cache.get(item.style_id)
+				self._futures[item.style_id] = self._executor.submit(self._compute, item.style_id, previous)
+
+	def submit_all(self, style_ids: Iterable[Optional[str]]) -> None:
+		for style_id in style_ids:
+			if not style_id or style_id in self._futures or style_id in self._empty:
+				continue
+			previous = self._cache.get(style_id)
+			if previous is not None and not self._refresh:
+				continue
+			self._futures[style_id] = self._executor.submit(self._compute, style_id, previous)
+
+	def expect_reads(self, style_ids: Iterable[str]) -> None:
+		for style_id in style_ids:
+			if style_id not in self._empty:
+				self._reads_left[style_id] = self._reads_left.get(style_id, 0) + 1
+
+	def result(self, style_id: str) -> ReviewCounts:
+		if style_id in self._empty:
+			return _empty_review_counts(self._now_utc)
+		future = self._futures.get(style_id)
+		if future is None:
+			cached = self._cache.get(style_id)
+			if cached is not None:
+				return cached
+			self.submit_all([style_id])
+			future = self._futures[style_id]
+		counts = future.result()
+		left = self._reads_left.get(style_id, 0) - 1
+		if left == 0:
+			# Last row for this style: stop holding its counts (the cache still has them).
+			del self._reads_left[style_id]
+			del self._futures[style_id]
+			self._gap_counts.pop(style_id, None)
+		elif left > 0:
+			self._reads_left[style_id] = left
+		return counts
+
+	def peek(self, style_id: str) -> Optional[ReviewCounts]:
+		"""Return finished or cached counts without waiting; None while a first fetch is pending."""
+		if style_id in self._empty:
+			return _empty_review_counts(self._now_utc)
+		future = self._futures.get(style_id)
+		if future is not None and future.done():
+			return future.result()
+		return self._cache.get(style_id)
+
+	def close(self) -> None:
+		# Pending work is dropped if we are unwinding early (error / Ctrl+C).
+		self._executor.shutdown(wait=True, cancel_futures=True)
+
+	def _compute(self, style_id: str, previous: Optional[ReviewCounts]) -> ReviewCounts:
+		pr = self._pr
 		try:
-			created_dt = datetime.fromtimestamp(int(created_ms) / 1000, tz=timezone.utc)
-		except Exception:
-			continue
+			counts = self._fetch_counts(pr, style_id, previous)
+		except requests.HTTPError as e:
+			status = e.response.status_code if e.response is not None else None
+			renewed = self._renew_pr(pr) if status in (401, 403) else None
+			if renewed is None:
+				raise
+			counts = self._fetch_counts(renewed, style_id, previous)
+		counts = dataclasses.replace(counts, gap_review_count=self._gap_counts.get(style_id))
+		self._cache.put(style_id, counts)
+		return counts
+
+	def _renew_pr(self, rejected: PowerReviewsConfig) -> Optional[PowerReviewsConfig]:
+		with self._pr_lock:
+			if self._pr is not rejected:
+				# Another worker already rediscovered it.
+				return self._pr
+			if self._rediscover_pr is None:
+				return None
+			rediscover, self._rediscover_pr = self._rediscover_pr, None
+			self._pr = rediscover()
+			return self._pr
+
+	def _fetch_counts(self, pr: PowerReviewsConfig, style_id: str, previous: Optional[ReviewCounts]) -> ReviewCounts:
+		counts: Optional[ReviewCounts] = None
+		if previous is not None:
+			counts = refresh_review_counts(
+				pr=pr,
+				style_id=style_id,
+				session=self._session,
+				now_utc=self._now_utc,
+				previous=previous,
+				years=self._years,
+				history_floor_ms=(_to_ms(self._history_floor) if self._history_floor else None),
+			)
+		if counts is None and self._bisect:
+			counts = compute_review_counts_bisect(
+				pr=pr,
+				style_id=style_id,
+				session=self._session,
+				now_utc=self._now_utc,
+				years=self._years,
+			)
+		elif counts is None:
+			counts = compute_review_counts(
+				pr=pr,
+				style_id=style_id,
+				session=self._session,
+				now_utc=self._now_utc,
+				page_concurrency=self._page_concurrency,
+				history_floor=self._history_floor,
+				years=self._years,
+			)
+		return counts
 
-		if created_dt >= last12_start:
-			last12 += 1
 
-		y = created_dt.year
-		if y in year_counts:
-			year_counts[y] += 1
+@dataclass(frozen=True)
+class _GapListing:
+	products: List[GapProduct]
+	page0_meta: Dict[str, Any]
+	use_style_api: bool
 
-	return last12, year_counts, total
 
+def _category_label(cid: Optional[str], category_url: str) -> str:
+	keyword = (_parse_params_from_gap_url(category_url).get("keyword") or "").strip()
+	if keyword:
+		return "search-" + "-".join(re.findall(r"[a-z0-9]+", keyword.lower()))
+	return f"cid-{cid}"
 
-def build_rows(
+
+def _fetch_listing(
 	*,
 	cid: Optional[str],
 	locale: str,
 	category_url: str,
 	session: requests.Session,
 	max_products: Optional[int],
-	gap_page_sleep_s: float,
-	pr_request_sleep_s: float,
-	granularity: str,
-	reviews_mode: str,
-	search_name_filter: bool,
-	pr_cache_path: Optional[str],
-	progress_every: int,
-) -> List[ProductRow]:
+	search_name_filter: bool,
+	gap_page_concurrency: int,
+) -> _GapListing:
 	extra = _parse_params_from_gap_url(category_url)
 	use_style_api = _gap_products_api_url(cid=cid, extra_params=extra) == GAP_PRODUCTS_STYLE_API
-	products = fetch_gap_products(
+	products, page0_meta = fetch_gap_products(
 		cid=cid,
 		locale=locale,
 		referer_url=category_url,
 		session=session,
-		page_sleep_s=gap_page_sleep_s,
 		extra_params=extra,
+		page_concurrency=gap_page_concurrency,
 	)
 
 	# For keyword searches, the raw API can include adjacent items (e.g., matching a collection/line)
@@ -440,67 +2041,87 @@ def build_rows(
 	if search_name_filter and use_style_api and keyword:
 		kw_tokens = [t for t in re.findall(r"[a-z0-9]+", keyword.lower()) if t]
 		if kw_tokens:
-			filtered: List[Dict[str, Any]] = []
+			filtered: List[GapProduct] = []
 			for p in products:
-				name_l = _style_name_from_product(p).lower()
+				name_l = p.name.lower()
 				if all(t in name_l for t in kw_tokens):
 					filtered.append(p)
 			products = filtered
 
 	if max_products is not None:
 		products = products[: max_products]
+	return _GapListing(products=products, page0_meta=page0_meta, use_style_api=use_style_api)
 
-	if not products:
-		return []
-
-	if reviews_mode not in {"powerreviews", "gap-only"}:
-		raise ValueError("reviews_mode must be one of: powerreviews, gap-only")
 
+def _resolve_pr_config(
+	*,
+	products: List[GapProduct],
+	session: requests.Session,
+	locale: str,
+	pr_config_cache_path: Optional[str],
+	pr_config_ttl_s: float,
+	rediscover: bool = False,
+) -> Tuple[PowerReviewsConfig, bool]:
+	"""Return ``(config, from_cache)``; ``rediscover`` drops the cached config and finds it again."""
 	pr: Optional[PowerReviewsConfig] = None
-	if reviews_mode == "powerreviews":
-		# Discover PR config from first product's first color id (pid/ccId)
-		colors0 = _colors_from_product(products[0])
-		sample_pid = _first_ccid(colors0)
-		if not sample_pid:
-			raise RuntimeError("Unable to find a sample product pid (ccId) from product list")
-		pr = discover_powerreviews_config(sample_pid=sample_pid, session=session, locale=locale)
-
-	now_utc = datetime.now(timezone.utc)
-	rows: List[ProductRow] = []
-	style_review_cache: Dict[str, Tuple[int, Dict[int, int], int]] = {}
-	if reviews_mode == "powerreviews" and pr_cache_path:
-		style_review_cache.update(_load_pr_cache(pr_cache_path))
-
+	if pr_config_cache_path and rediscover:
+		_discard_pr_config_cache(pr_config_cache_path, locale=locale)
+	elif pr_config_cache_path:
+		# merchantId/apiKey are site-wide, so a recently discovered config is reused across runs.
+		pr = _load_pr_config_cache(pr_config_cache_path, locale=locale, ttl_s=pr_config_ttl_s)
+	if pr is not None:
+		return pr, True
+	# Discover PR config from first product's first color id (pid/ccId)
+	sample_pid = _first_ccid(products[0].colors)
+	if not sample_pid:
+		raise RuntimeError("Unable to find a sample product pid (ccId) from product list")
+	pr = discover_powerreviews_config(sample_pid=sample_pid, session=session, locale=locale)
+	if pr_config_cache_path:
+		_save_pr_config_cache(pr_config_cache_path, pr)
+	return pr, False
+
+
+def _use_color_rows(listing: _GapListing, granularity: str) -> bool:
 	# Auto mode: if totalColors is much higher than style count, expand to color rows.
 	# This matches large grids like GapBody (705+ items).
-	if granularity not in {"auto", "style", "color"}:
-		raise ValueError("granularity must be one of: auto, style, color")
-	use_color_rows: bool
-	if use_style_api:
+	if listing.use_style_api:
 		# Search pages return "items" (often one per color), so auto should match the grid.
-		use_color_rows = (granularity in {"auto", "color"})
-	elif granularity == "style":
-		use_color_rows = False
-	elif granularity == "color":
-		use_color_rows = True
-	else:
-		# best-effort heuristic
-		api_url = _gap_products_api_url(cid=cid, extra_params=extra)
-		use_style_api = api_url == GAP_PRODUCTS_STYLE_API
-		base_params: Dict[str, str] = {"locale": locale, "pageNumber": "0"}
-		if cid and not use_style_api:
-			base_params["cid"] = str(cid)
-		if use_style_api:
-			base_params["pageSize"] = "200"
-		base_params.update({k: v for k, v in extra.items() if k not in {"cid", "locale", "pageNumber", "pageId"}})
-		page0 = session.get(
-			api_url,
-			params=base_params,
-			headers={"Referer": category_url},
-			timeout=30,
-		).json()
-		total_colors = _safe_int(page0.get("totalColors"))
-		use_color_rows = bool(total_colors and total_colors > len(products))
+		return granularity in {"auto", "color"}
+	if granularity == "style":
+		return False
+	if granularity == "color":
+		return True
+	# best-effort heuristic, using the totalColors already returned with the first listing page
+	total_colors = _safe_int(listing.page0_meta.get("totalColors"))
+	return bool(total_colors and total_colors > len(listing.products))
+
+
+def _review_reads(listing: _GapListing, granularity: str) -> List[str]:
+	# The style ids _iter_rows_for_listing looks up, one entry per lookup.
+	style_ids = [p.style_id for p in listing.products if p.style_id]
+	if listing.use_style_api and not _use_color_rows(listing, granularity):
+		return list(dict.fromkeys(style_ids))
+	return style_ids
+
+
+def _iter_rows_for_listing(
+	*,
+	listing: _GapListing,
+	granularity: str,
+	use_powerreviews: bool,
+	review_pool: Optional[_ReviewCountPool],
+	now_utc: datetime,
+	buckets: Sequence[ReviewBucket],
+	progress_every: int,
+	years: Sequence[int],
+	stale_ok: bool = False,
+) -> Iterator[ProductRow]:
+	products = listing.products
+	use_style_api = listing.use_style_api
+	if not products:
+		return
+
+	use_color_rows = _use_color_rows(listing, granularity)
 
 	# For the search (style) API, each product entry typically represents a single grid item.
 	# In style granularity, we group these back into unique styles.
@@ -508,21 +2129,19 @@ def build_rows(
 		ordered_style_ids: List[str] = []
 		style_agg: Dict[str, Dict[str, Any]] = {}
 		for p in products:
-			style_id = _style_id_from_product(p)
+			style_id = p.style_id
 			if not style_id:
 				continue
-			colors = _colors_from_product(p)
-			first_color = colors[0] if colors else {}
-			pid = first_color.get("id") or first_color.get("ccId")
-			pid_s = str(pid) if pid else ""
-			price = _price_from_style_color(first_color) if first_color else None
+			first_color = p.colors[0] if p.colors else None
+			pid_s = (first_color.pid or "") if first_color else ""
+			price = first_color.price if first_color else None
 			agg = style_agg.get(style_id)
 			if agg is None:
 				ordered_style_ids.append(style_id)
 				agg = {
-					"name": _style_name_from_product(p),
-					"rating": _safe_float(p.get("reviewScore")),
-					"reviews_count": _safe_int(p.get("reviewCount")),
+					"name": p.name,
+					"rating": p.rating,
+					"reviews_count": p.review_count,
 					"min_price": price,
 					"pid": pid_s,
 				}
@@ -533,8 +2152,9 @@ def build_rows(
 				if not agg.get("pid") and pid_s:
 					agg["pid"] = pid_s
 
-		rows: List[ProductRow] = []
-		style_review_cache: Dict[str, Tuple[int, Dict[int, int], int]] = {}
+		if review_pool is not None:
+			review_pool.submit_all(ordered_style_ids)
+
 		seen_styles = set()
 		for i, style_id in enumerate(ordered_style_ids, start=1):
 			if style_id in seen_styles:
@@ -549,135 +2169,124 @@ def build_rows(
 			price = agg.get("min_price")
 
 			last12: Optional[int]
-			year_counts: Dict[int, int]
+			year_counts: Dict[int, Optional[int]]
 			pr_total: Optional[int]
-			if reviews_mode == "powerreviews":
-				if pr is None:
+			as_of_ms: Optional[int] = None
+			if use_powerreviews:
+				if review_pool is None:
 					raise RuntimeError("PowerReviews config missing")
-				if style_id not in style_review_cache:
-					last12_i, year_counts_i, pr_total_i = compute_review_counts(
-						pr=pr,
-						style_id=style_id,
-						session=session,
-						now_utc=now_utc,
-						request_sleep_s=pr_request_sleep_s,
-					)
-					style_review_cache[style_id] = (last12_i, year_counts_i, pr_total_i)
-					if pr_cache_path:
-						_save_pr_cache(pr_cache_path, style_review_cache)
+				counts = review_pool.peek(style_id) if stale_ok else review_pool.result(style_id)
+				if counts is None:
+					# --stale-ok first pass: nothing cached yet, so the counts stay blank until the rewrite.
+					last12 = None
+					year_counts = dict.fromkeys(years)
+					bucket_counts = {b.label: None for b in buckets}
+					pr_total = None
 				else:
-					last12_i, year_counts_i, pr_total_i = style_review_cache[style_id]
-				last12 = last12_i
-				year_counts = year_counts_i
-				pr_total = pr_total_i
+					last12, year_counts, bucket_counts = _review_values(
+						counts, now_utc=now_utc, buckets=buckets, years=years
+					)
+					pr_total = counts.total
+					as_of_ms = counts.as_of_ms
 			else:
 				last12 = None
-				year_counts = {2020: 0, 2021: 0, 2022: 0, 2023: 0, 2024: 0, 2025: 0}
+				year_counts = dict.fromkeys(years, 0)
+				bucket_counts = {b.label: None for b in buckets}
 				pr_total = None
 
 			if reviews_count is None and pr_total is not None:
 				reviews_count = pr_total
 
-			rows.append(
-				ProductRow(
-					brand_name="Gap",
-					full_name=full_name,
-					price=price,
-					product_rating=rating,
-					customer_reviews_count=reviews_count,
-					product_url=product_url,
-					customer_reviews_last_12_months_count=last12,
-					customer_reviews_2020_count=year_counts[2020],
-					customer_reviews_2021_count=year_counts[2021],
-					customer_reviews_2022_count=year_counts[2022],
-					customer_reviews_2023_count=year_counts[2023],
-					customer_reviews_2024_count=year_counts[2024],
-					customer_reviews_2025_count=year_counts[2025],
-				)
+			yield ProductRow(
+				brand_name="Gap",
+				full_name=full_name,
+				price=price,
+				product_rating=rating,
+				customer_reviews_count=reviews_count,
+				product_url=product_url,
+				customer_reviews_last_12_months_count=last12,
+				year_counts=year_counts,
+				bucket_counts=bucket_counts,
+				counts_as_of_ms=as_of_ms,
 			)
 			if progress_every > 0 and (i == 1 or i == len(ordered_style_ids) or i % progress_every == 0):
 				print(f"[{i}/{len(ordered_style_ids)}] {full_name} | reviews={reviews_count} | price={price}")
 
-		return rows
+		return
+
+	if review_pool is not None:
+		review_pool.submit_all(p.style_id for p in products)
 
 	seen_style_ids: set[str] = set()
 	seen_pids: set[str] = set()
 	for i, p in enumerate(products, start=1):
-		style_id = _style_id_from_product(p)
+		style_id = p.style_id
 		if not style_id:
 			continue
-		full_name = _style_name_from_product(p)
-		style_colors = _colors_from_product(p)
+		full_name = p.name
+		style_colors = p.colors
 
-		rating = _safe_float(p.get("reviewScore"))
+		rating = p.rating
 
 		last12: Optional[int]
-		year_counts: Dict[int, int]
+		year_counts: Dict[int, Optional[int]]
 		pr_total: Optional[int]
-		if reviews_mode == "powerreviews":
-			if pr is None:
+		as_of_ms: Optional[int] = None
+		if use_powerreviews:
+			if review_pool is None:
 				raise RuntimeError("PowerReviews config missing")
-			if style_id not in style_review_cache:
-				last12_i, year_counts_i, pr_total_i = compute_review_counts(
-					pr=pr,
-					style_id=style_id,
-					session=session,
-					now_utc=now_utc,
-					request_sleep_s=pr_request_sleep_s,
-				)
-				style_review_cache[style_id] = (last12_i, year_counts_i, pr_total_i)
-				if pr_cache_path:
-					_save_pr_cache(pr_cache_path, style_review_cache)
+			counts = review_pool.peek(style_id) if stale_ok else review_pool.result(style_id)
+			if counts is None:
+				# --stale-ok first pass: nothing cached yet, so the counts stay blank until the rewrite.
+				last12 = None
+				year_counts = dict.fromkeys(years)
+				bucket_counts = {b.label: None for b in buckets}
+				pr_total = None
 			else:
-				last12_i, year_counts_i, pr_total_i = style_review_cache[style_id]
-			last12 = last12_i
-			year_counts = year_counts_i
-			pr_total = pr_total_i
+				last12, year_counts, bucket_counts = _review_values(
+					counts, now_utc=now_utc, buckets=buckets, years=years
+				)
+				pr_total = counts.total
+				as_of_ms = counts.as_of_ms
 		else:
 			last12 = None
-			year_counts = {2020: 0, 2021: 0, 2022: 0, 2023: 0, 2024: 0, 2025: 0}
+			year_counts = dict.fromkeys(years, 0)
+			bucket_counts = {b.label: None for b in buckets}
 			pr_total = None
 
 		# Use Gap's reviewCount as the overall count shown on the category/product UI.
 		# PowerReviews paging.total_results counts written reviews; Gap's value can be higher
 		# because it may include star ratings without review text.
-		reviews_count = _safe_int(p.get("reviewCount"))
+		reviews_count = p.review_count
 		if reviews_count is None and pr_total is not None:
 			reviews_count = pr_total
 
 		if use_color_rows:
 			# For search API items, treat each product entry as a single grid item (often one color).
 			if use_style_api:
-				first_color = style_colors[0] if style_colors else {}
-				pid = first_color.get("id") or first_color.get("ccId")
-				if not pid:
+				if not style_colors or not style_colors[0].pid:
 					continue
-				pid_s = str(pid)
+				first_color = style_colors[0]
+				pid_s = str(first_color.pid)
 				if pid_s in seen_pids:
 					continue
 				seen_pids.add(pid_s)
 				product_url = f"{GAP_BASE}/browse/product.do?pid={pid_s}"
-				cc_name = (first_color.get("ccName") or first_color.get("name") or "").strip()
 				display_name = full_name
-				if cc_name:
-					display_name = f"{full_name} - {cc_name}"
-				price = _price_from_style_color(first_color)
-				rows.append(
-					ProductRow(
-						brand_name="Gap",
-						full_name=display_name,
-						price=price,
-						product_rating=rating,
-						customer_reviews_count=reviews_count,
-						product_url=product_url,
-						customer_reviews_last_12_months_count=last12,
-						customer_reviews_2020_count=year_counts[2020],
-						customer_reviews_2021_count=year_counts[2021],
-						customer_reviews_2022_count=year_counts[2022],
-						customer_reviews_2023_count=year_counts[2023],
-						customer_reviews_2024_count=year_counts[2024],
-						customer_reviews_2025_count=year_counts[2025],
-					)
+				if first_color.name:
+					display_name = f"{full_name} - {first_color.name}"
+				price = first_color.price
+				yield ProductRow(
+					brand_name="Gap",
+					full_name=display_name,
+					price=price,
+					product_rating=rating,
+					customer_reviews_count=reviews_count,
+					product_url=product_url,
+					customer_reviews_last_12_months_count=last12,
+					year_counts=year_counts,
+					bucket_counts=bucket_counts,
+					counts_as_of_ms=as_of_ms,
 				)
 				if progress_every > 0 and (i == 1 or i == len(products) or i % progress_every == 0):
 					print(f"[{i}/{len(products)}] {display_name} | reviews={reviews_count} | price={price}")
@@ -686,35 +2295,28 @@ def build_rows(
 			# Category API: expand each style into color rows.
 			seen_ccids: set[str] = set()
 			for sc in style_colors:
-				ccid = sc.get("ccId") or sc.get("id")
-				if not ccid:
+				if not sc.ccid:
 					continue
-				ccid_s = str(ccid)
+				ccid_s = sc.ccid
 				if ccid_s in seen_ccids:
 					continue
 				seen_ccids.add(ccid_s)
 				product_url = f"{GAP_BASE}/browse/product.do?pid={ccid_s}"
-				cc_name = (sc.get("ccName") or sc.get("name") or "").strip()
 				display_name = full_name
-				if cc_name:
-					display_name = f"{full_name} - {cc_name}"
-				price = _price_from_style_color(sc)
-				rows.append(
-					ProductRow(
-						brand_name="Gap",
-						full_name=display_name,
-						price=price,
-						product_rating=rating,
-						customer_reviews_count=reviews_count,
-						product_url=product_url,
-						customer_reviews_last_12_months_count=last12,
-						customer_reviews_2020_count=year_counts[2020],
-						customer_reviews_2021_count=year_counts[2021],
-						customer_reviews_2022_count=year_counts[2022],
-						customer_reviews_2023_count=year_counts[2023],
-						customer_reviews_2024_count=year_counts[2024],
-						customer_reviews_2025_count=year_counts[2025],
-					)
+				if sc.name:
+					display_name = f"{full_name} - {sc.name}"
+				price = sc.price
+				yield ProductRow(
+					brand_name="Gap",
+					full_name=display_name,
+					price=price,
+					product_rating=rating,
+					customer_reviews_count=reviews_count,
+					product_url=product_url,
+					customer_reviews_last_12_months_count=last12,
+					year_counts=year_counts,
+					bucket_counts=bucket_counts,
+					counts_as_of_ms=as_of_ms,
 				)
 			if progress_every > 0 and (i == 1 or i == len(products) or i % progress_every == 0):
 				print(f"[{i}/{len(products)}] {full_name} | style={style_id} | colors={len(style_colors)}")
@@ -725,88 +2327,542 @@ def build_rows(
 			ccid = _first_ccid(style_colors)
 			product_url = f"{GAP_BASE}/browse/product.do?pid={ccid}" if ccid else ""
 			price = _min_price_from_style_colors(style_colors)
-			rows.append(
-				ProductRow(
-					brand_name="Gap",
-					full_name=full_name,
-					price=price,
-					product_rating=rating,
-					customer_reviews_count=reviews_count,
-					product_url=product_url,
-					customer_reviews_last_12_months_count=last12,
-					customer_reviews_2020_count=year_counts[2020],
-					customer_reviews_2021_count=year_counts[2021],
-					customer_reviews_2022_count=year_counts[2022],
-					customer_reviews_2023_count=year_counts[2023],
-					customer_reviews_2024_count=year_counts[2024],
-					customer_reviews_2025_count=year_counts[2025],
-				)
+			yield ProductRow(
+				brand_name="Gap",
+				full_name=full_name,
+				price=price,
+				product_rating=rating,
+				customer_reviews_count=reviews_count,
+				product_url=product_url,
+				customer_reviews_last_12_months_count=last12,
+				year_counts=year_counts,
+				bucket_counts=bucket_counts,
+				counts_as_of_ms=as_of_ms,
 			)
 			if progress_every > 0 and (i == 1 or i == len(products) or i % progress_every == 0):
 				print(f"[{i}/{len(products)}] {full_name} | reviews={reviews_count} | price={price}")
 
-	return rows
-
-
-def write_csv(rows: List[ProductRow], out_path: str, *, excel_hyperlinks: bool = False) -> None:
-	fieldnames = [
-		"Brand Name",
-		"Full Name",
-		"Price",
-		"Product Rating",
-		"Customer Reviews Count",
-		"Product URL",
-		"Customer Reviews (Last 12 Months) Count",
-		"Customer Reviews 2020 Count",
-		"Customer Reviews 2021 Count",
-		"Customer Reviews 2022 Count",
-		"Customer Reviews 2023 Count",
-		"Customer Reviews 2024 Count",
-		"Customer Reviews 2025 Count",
-	]
-	with open(out_path, "w", newline="", encoding="utf-8") as f:
-		w = csv.DictWriter(f, fieldnames=fieldnames)
-		w.writeheader()
-		for r in rows:
-			url_cell = r.product_url
-			if excel_hyperlinks and url_cell:
-				# Excel will interpret this as a clickable hyperlink when opening the CSV.
-				url_cell = f'=HYPERLINK("{url_cell}","{url_cell}")'
-			w.writerow(
-				{
-					"Brand Name": r.brand_name,
-					"Full Name": r.full_name,
-					"Price": ("" if r.price is None else f"{r.price:.2f}"),
-					"Product Rating": ("" if r.product_rating is None else f"{r.product_rating:.2f}"),
-					"Customer Reviews Count": ("" if r.customer_reviews_count is None else str(r.customer_reviews_count)),
-					"Product URL": url_cell,
-					"Customer Reviews (Last 12 Months) Count": (
-						"" if r.customer_reviews_last_12_months_count is None else str(r.customer_reviews_last_12_months_count)
-					),
-					"Customer Reviews 2020 Count": ("" if r.customer_reviews_2020_count is None else str(r.customer_reviews_2020_count)),
-					"Customer Reviews 2021 Count": ("" if r.customer_reviews_2021_count is None else str(r.customer_reviews_2021_count)),
-					"Customer Reviews 2022 Count": ("" if r.customer_reviews_2022_count is None else str(r.customer_reviews_2022_count)),
-					"Customer Reviews 2023 Count": ("" if r.customer_reviews_2023_count is None else str(r.customer_reviews_2023_count)),
-					"Customer Reviews 2024 Count": ("" if r.customer_reviews_2024_count is None else str(r.customer_reviews_2024_count)),
-					"Customer Reviews 2025 Count": ("" if r.customer_reviews_2025_count is None else str(r.customer_reviews_2025_count)),
-				}
+
+def _fetch_listings(
+	categories: Sequence[Tuple[Optional[str], str]],
+	*,
+	locale: str,
+	session: requests.Session,
+	max_products: Optional[int],
+	search_name_filter: bool,
+	gap_page_concurrency: int,
+	category_concurrency: int,
+) -> List[_GapListing]:
+	def fetch(category: Tuple[Optional[str], str]) -> _GapListing:
+		cid, category_url = category
+		return _fetch_listing(
+			cid=cid,
+			locale=locale,
+			category_url=category_url,
+			session=session,
+			max_products=max_products,
+			search_name_filter=search_name_filter,
+			gap_page_concurrency=gap_page_concurrency,
+		)
+
+	with ThreadPoolExecutor(max_workers=max(1, int(category_concurrency)), thread_name_prefix="listing") as executor:
+		return list(executor.map(fetch, categories))
+
+
+def _plan_for_listings(
+	listings: Sequence[_GapListing],
+	*,
+	cache: Any,
+	reviews_mode: str,
+	refresh: bool,
+	expires_before_ms: Optional[int] = None,
+	years: Sequence[int] = (),
+	history_floor_ms: Optional[int] = None,
+) -> _ReviewWorkPlan:
+	return _plan_review_work(
+		((p.style_id, p.review_count) for listing in listings for p in listing.products),
+		cache=cache,
+		bisect=(reviews_mode == "powerreviews-bisect"),
+		refresh=refresh,
+		expires_before_ms=expires_before_ms,
+		years=years,
+		history_floor_ms=history_floor_ms,
+	)
+
+
+def plan_categories(
+	*,
+	categories: Sequence[Tuple[Optional[str], str]],
+	locale: str,
+	session: requests.Session,
+	max_products: Optional[int],
+	reviews_mode: str,
+	search_name_filter: bool,
+	pr_cache_path: Optional[str],
+	pr_refresh: bool = False,
+	pr_cache_backend: str = "auto",
+	gap_page_concurrency: int = 1,
+	category_concurrency: int = 1,
+	pr_max_age_s: Optional[float] = None,
+	years: Optional[Sequence[int]] = None,
+	buckets: Sequence[ReviewBucket] = (),
+) -> _ReviewWorkPlan:
+	"""Fetch only the Gap listings and cost the PowerReviews work (``--plan``); no PowerReviews traffic."""
+	listings = _fetch_listings(
+		categories,
+		locale=locale,
+		session=session,
+		max_products=max_products,
+		search_name_filter=search_name_filter,
+		gap_page_concurrency=gap_page_concurrency,
+		category_concurrency=category_concurrency,
+	)
+	if reviews_mode == "gap-only":
+		return _ReviewWorkPlan(items=[], empty=[], cached=[])
+	cache = _open_pr_cache(pr_cache_path, pr_cache_backend)
+	try:
+		return _plan_for_listings(
+			listings,
+			cache=cache,
+			reviews_mode=reviews_mode,
+			refresh=pr_refresh,
+			expires_before_ms=(_to_ms(datetime.now(timezone.utc)) - int(pr_max_age_s * 1000) if pr_max_age_s else None),
+			years=tuple(years or _default_years(datetime.now(timezone.utc))),
+			history_floor_ms=min((b.start_ms for b in buckets), default=None),
+		)
+	finally:
+		cache.close()
+
+
+def build_rows_for_categories(
+	*,
+	categories: Sequence[Tuple[Optional[str], str]],
+	locale: str,
+	session: requests.Session,
+	max_products: Optional[int],
+	granularity: str,
+	reviews_mode: str,
+	search_name_filter: bool,
+	pr_cache_path: Optional[str],
+	progress_every: int,
+	pr_concurrency: int = 1,
+	pr_page_concurrency: int = 1,
+	pr_refresh: bool = False,
+	pr_cache_backend: str = "auto",
+	gap_page_concurrency: int = 1,
+	buckets: Sequence[ReviewBucket] = (),
+	pr_config_cache_path: Optional[str] = None,
+	pr_config_ttl_s: float = 7 * 24 * 3600.0,
+	category_concurrency: int = 1,
+	pr_max_age_s: Optional[float] = None,
+	on_stale_rows: Optional[Callable[[List[Tuple[str, ProductRow]]], None]] = None,
+	years: Optional[Sequence[int]] = None,
+) -> Iterator[Tuple[str, ProductRow]]:
+	"""Yield ``(category_label, row)`` for several ``(cid, category_url)`` pairs, computing each style once."""
+	if reviews_mode not in {"powerreviews", "powerreviews-bisect", "gap-only"}:
+		raise ValueError("reviews_mode must be one of: powerreviews, powerreviews-bisect, gap-only")
+	if granularity not in {"auto", "style", "color"}:
+		raise ValueError("granularity must be one of: auto, style, color")
+	use_powerreviews = reviews_mode != "gap-only"
+	listings = _fetch_listings(
+		categories,
+		locale=locale,
+		session=session,
+		max_products=max_products,
+		search_name_filter=search_name_filter,
+		gap_page_concurrency=gap_page_concurrency,
+		category_concurrency=category_concurrency,
+	)
+
+	now_utc = datetime.now(timezone.utc)
+	years = tuple(years or _default_years(now_utc))
+	first_products = next((listing.products for listing in listings if listing.products), None)
+	style_review_cache: Any = None
+	review_pool: Optional[_ReviewCountPool] = None
+	if use_powerreviews and first_products:
+		def resolve_pr(rediscover: bool = False) -> Tuple[PowerReviewsConfig, bool]:
+			return _resolve_pr_config(
+				products=first_products,
+				session=session,
+				locale=locale,
+				pr_config_cache_path=pr_config_cache_path,
+				pr_config_ttl_s=pr_config_ttl_s,
+				rediscover=rediscover,
+			)
+
+		def rediscover_pr() -> PowerReviewsConfig:
+			print("PowerReviews rejected the cached merchantId/apiKey; rediscovering them from a PDP")
+			return resolve_pr(rediscover=True)[0]
+
+		pr, pr_from_cache = resolve_pr()
+		style_review_cache = _open_pr_cache(pr_cache_path, pr_cache_backend)
+		review_pool = _ReviewCountPool(
+			pr=pr,
+			session=session,
+			now_utc=now_utc,
+			cache=style_review_cache,
+			concurrency=pr_concurrency,
+			page_concurrency=pr_page_concurrency,
+			bisect=(reviews_mode == "powerreviews-bisect"),
+			refresh=pr_refresh,
+			years=years,
+			history_floor=(
+				datetime.fromtimestamp(min(b.start_ms for b in buckets) / 1000, tz=timezone.utc) if buckets else None
+			),
+			rediscover_pr=(rediscover_pr if pr_from_cache else None),
+		)
+	try:
+		if review_pool is not None:
+			# Plan every category's styles up front: one entry per style id, heaviest first.
+			plan = _plan_for_listings(
+				listings,
+				cache=style_review_cache,
+				reviews_mode=reviews_mode,
+				refresh=pr_refresh,
+				expires_before_ms=(_to_ms(datetime.now(timezone.utc)) - int(pr_max_age_s * 1000) if pr_max_age_s else None),
+				years=years,
+				history_floor_ms=min((b.start_ms for b in buckets), default=None),
 			)
+			if progress_every > 0:
+				_print_plan(plan, concurrency=pr_concurrency, page_concurrency=pr_page_concurrency)
+			review_pool.submit_plan(plan)
+			review_pool.expect_reads(
+				style_id for listing in listings for style_id in _review_reads(listing, granularity)
+			)
+		if on_stale_rows is not None:
+			# Stale-while-revalidate: a first pass from what is cached now, pending styles left blank.
+			stale_rows: List[Tuple[str, ProductRow]] = []
+			for (cid, category_url), listing in zip(categories, listings):
+				label = _category_label(cid, category_url)
+				for row in _iter_rows_for_listing(
+					listing=listing,
+					granularity=granularity,
+					use_powerreviews=use_powerreviews,
+					review_pool=review_pool,
+					now_utc=now_utc,
+					buckets=buckets,
+					progress_every=0,
+					years=years,
+					stale_ok=True,
+				):
+					stale_rows.append((label, dataclasses.replace(row, category=label)))
+			on_stale_rows(stale_rows)
+		for (cid, category_url), listing in zip(categories, listings):
+			label = _category_label(cid, category_url)
+			# The pool's futures are the reorder buffer: styles finish in any order, but each
+			# row waits on its own style's future, so output order matches the listing.
+			for row in _iter_rows_for_listing(
+				listing=listing,
+				granularity=granularity,
+				use_powerreviews=use_powerreviews,
+				review_pool=review_pool,
+				now_utc=now_utc,
+				buckets=buckets,
+				progress_every=progress_every,
+				years=years,
+			):
+				yield label, dataclasses.replace(row, category=label)
+	finally:
+		if review_pool is not None:
+			review_pool.close()
+		if style_review_cache is not None:
+			style_review_cache.close()
+
+
+def build_rows(
+	*,
+	cid: Optional[str],
+	locale: str,
+	category_url: str,
+	session: requests.Session,
+	max_products: Optional[int],
+	granularity: str,
+	reviews_mode: str,
+	search_name_filter: bool,
+	pr_cache_path: Optional[str],
+	progress_every: int,
+	pr_concurrency: int = 1,
+	pr_page_concurrency: int = 1,
+	pr_refresh: bool = False,
+	pr_cache_backend: str = "auto",
+	gap_page_concurrency: int = 1,
+	buckets: Sequence[ReviewBucket] = (),
+	pr_config_cache_path: Optional[str] = None,
+	pr_config_ttl_s: float = 7 * 24 * 3600.0,
+	pr_max_age_s: Optional[float] = None,
+	years: Optional[Sequence[int]] = None,
+) -> Iterator[ProductRow]:
+	for _label, row in build_rows_for_categories(
+		categories=[(cid, category_url)],
+		locale=locale,
+		session=session,
+		max_products=max_products,
+		granularity=granularity,
+		reviews_mode=reviews_mode,
+		search_name_filter=search_name_filter,
+		pr_cache_path=pr_cache_path,
+		progress_every=progress_every,
+		pr_concurrency=pr_concurrency,
+		pr_page_concurrency=pr_page_concurrency,
+		pr_refresh=pr_refresh,
+		pr_cache_backend=pr_cache_backend,
+		gap_page_concurrency=gap_page_concurrency,
+		buckets=buckets,
+		pr_config_cache_path=pr_config_cache_path,
+		pr_config_ttl_s=pr_config_ttl_s,
+		pr_max_age_s=pr_max_age_s,
+		years=years,
+	):
+		yield row
+
+
+class _CsvRowWriter:
+	"""Writes ``ProductRow``s to a CSV as they arrive; ``atomic=True`` swaps a temp file in on ``close()``."""
+
+	def __init__(
+		self,
+		out_path: str,
+		*,
+		excel_hyperlinks: bool = False,
+		buckets: Sequence[ReviewBucket] = (),
+		with_category: bool = False,
+		with_age: bool = False,
+		atomic: bool = False,
+		years: Optional[Sequence[int]] = None,
+	) -> None:
+		self._year_columns = [
+			(y, f"Customer Reviews {y} Count") for y in (years or _default_years(datetime.now(timezone.utc)))
+		]
+		fieldnames = [
+			"Brand Name",
+			"Full Name",
+			"Price",
+			"Product Rating",
+			"Customer Reviews Count",
+			"Product URL",
+			"Customer Reviews (Last 12 Months) Count",
+			*(column for _y, column in self._year_columns),
+		]
+		self._bucket_columns: List[Tuple[str, str]] = []
+		for b in buckets:
+			column = f"Customer Reviews {b.label} Count"
+			# A bucket like "2024" duplicates a fixed year column; keep the fixed one.
+			if column not in fieldnames:
+				fieldnames.append(column)
+				self._bucket_columns.append((b.label, column))
+		if with_category:
+			fieldnames.insert(0, "Category")
+		if with_age:
+			fieldnames.append("Review Counts Age (Hours)")
+		self.out_path = out_path
+		self._excel_hyperlinks = excel_hyperlinks
+		self._with_category = with_category
+		self._with_age = with_age
+		# Per-writer temp name: the stale-ok pass and the final pass may both be open at once.
+		self._tmp_path = f"{out_path}.{id(self):x}.tmp" if atomic else None
+		self.rows_written = 0
+		self._f = open(self._tmp_path or out_path, "w", newline="", encoding="utf-8")
+		self._writer = csv.DictWriter(self._f, fieldnames=fieldnames)
+		self._writer.writeheader()
+		self._f.flush()
+
+	def write(self, r: ProductRow) -> None:
+		url_cell = r.product_url
+		if self._excel_hyperlinks and url_cell:
+			# Excel will interpret this as a clickable hyperlink when opening the CSV.
+			url_cell = f'=HYPERLINK("{url_cell}","{url_cell}")'
+		extra_cells = {}
+		if self._with_category:
+			extra_cells["Category"] = r.category
+		if self._with_age:
+			age_h = None if r.counts_as_of_ms is None else max(0.0, time.time() * 1000 - r.counts_as_of_ms) / 3_600_000
+			extra_cells["Review Counts Age (Hours)"] = "" if age_h is None else f"{age_h:.1f}"
+		for y, column in self._year_columns:
+			value = r.year_counts.get(y)
+			extra_cells[column] = "" if value is None else str(value)
+		for label, column in self._bucket_columns:
+			value = r.bucket_counts.get(label)
+			extra_cells[column] = "" if value is None else str(value)
+		self._writer.writerow(
+			{
+				"Brand Name": r.brand_name,
+				"Full Name": r.full_name,
+				"Price": ("" if r.price is None else f"{r.price:.2f}"),
+				"Product Rating": ("" if r.product_rating is None else f"{r.product_rating:.2f}"),
+				"Customer Reviews Count": ("" if r.customer_reviews_count is None else str(r.customer_reviews_count)),
+				"Product URL": url_cell,
+				"Customer Reviews (Last 12 Months) Count": (
+					"" if r.customer_reviews_last_12_months_count is None else str(r.customer_reviews_last_12_months_count)
+				),
+				**extra_cells,
+			}
+		)
+		self._f.flush()
+		self.rows_written += 1
+
+	def close(self, *, complete: bool = True) -> None:
+		self._f.close()
+		if self._tmp_path is None:
+			return
+		if complete:
+			os.replace(self._tmp_path, self.out_path)
+		else:
+			os.remove(self._tmp_path)
+
+
+def write_csv(
+	rows: Iterable[ProductRow],
+	out_path: str,
+	*,
+	excel_hyperlinks: bool = False,
+	buckets: Sequence[ReviewBucket] = (),
+	with_category: bool = False,
+	with_age: bool = False,
+	atomic: bool = False,
+	years: Optional[Sequence[int]] = None,
+) -> int:
+	writer = _CsvRowWriter(
+		out_path,
+		excel_hyperlinks=excel_hyperlinks,
+		buckets=buckets,
+		with_category=with_category,
+		with_age=with_age,
+		atomic=atomic,
+		years=years,
+	)
+	complete = False
+	try:
+		for r in rows:
+			writer.write(r)
+		complete = True
+	finally:
+		writer.close(complete=complete)
+	return writer.rows_written
+
+
+def _write_outputs(
+	results: Iterable[Tuple[str, ProductRow]],
+	*,
+	categories: Sequence[Tuple[Optional[str], str]],
+	out_path: str,
+	combined: bool,
+	excel_hyperlinks: bool,
+	buckets: Sequence[ReviewBucket],
+	with_age: bool = False,
+	atomic: bool = False,
+	years: Optional[Sequence[int]] = None,
+) -> None:
+	if len(categories) == 1 or combined:
+		n = write_csv(
+			(row for _label, row in results),
+			out_path,
+			excel_hyperlinks=excel_hyperlinks,
+			buckets=buckets,
+			with_category=(len(categories) > 1),
+			with_age=with_age,
+			atomic=atomic,
+			years=years,
+		)
+		print(f"Wrote {n} rows to {out_path}")
+		return
+
+	# One CSV per category, each written as its rows arrive.
+	writers: Dict[str, _CsvRowWriter] = {}
+
+	def open_writer(label: str) -> _CsvRowWriter:
+		return _CsvRowWriter(
+			_category_out_path(out_path, label),
+			excel_hyperlinks=excel_hyperlinks,
+			buckets=buckets,
+			with_age=with_age,
+			atomic=atomic,
+			years=years,
+		)
+
+	complete = False
+	try:
+		for label, row in results:
+			if label not in writers:
+				writers[label] = open_writer(label)
+			writers[label].write(row)
+		for cid, url in categories:
+			# Categories with no products still get a header-only CSV.
+			label = _category_label(cid, url)
+			if label not in writers:
+				writers[label] = open_writer(label)
+		complete = True
+	finally:
+		for writer in writers.values():
+			writer.close(complete=complete)
+	for writer in writers.values():
+		print(f"Wrote {writer.rows_written} rows to {writer.out_path}")
+
+
+DEFAULT_CATEGORY_URL = (
+	"https://www.gap.com/browse/women/gapbody?cid=1140272"
+	"#pageId=0&department=136&mlink=5643,20012060,DP_1_W_LoveByGap"
+)
+
+
+def _read_urls_file(path: str) -> List[str]:
+	with open(path, "r", encoding="utf-8") as f:
+		lines = [line.strip() for line in f]
+	return [line for line in lines if line and not line.startswith("#")]
+
+
+def _category_out_path(out_path: str, label: str) -> str:
+	if "{category}" in out_path:
+		return out_path.replace("{category}", label)
+	stem, ext = os.path.splitext(out_path)
+	return f"{stem}_{label}{ext or '.csv'}"
+
+
+def _parse_years(spec: str, *, now_utc: datetime) -> Tuple[int, ...]:
+	"""Parse ``--years``: ``2020-2026``, ``2020-`` (through the current year) or ``2024``."""
+	m = re.fullmatch(r"\s*(\d{4})\s*(?:(-)\s*(\d{4})?)?\s*", spec)
+	if not m:
+		raise ValueError(f"Invalid --years {spec!r}: expected YYYY, YYYY-YYYY or YYYY-")
+	first = int(m.group(1))
+	last = int(m.group(3)) if m.group(3) else (now_utc.year if m.group(2) else first)
+	if last < first:
+		raise ValueError(f"Invalid --years {spec!r}: range is empty")
+	return tuple(range(first, last + 1))
 
 
 def parse_args() -> argparse.Namespace:
 	p = argparse.ArgumentParser(description="Scrape Gap category products + review counts into CSV")
 	p.add_argument(
 		"--url",
-		default=(
-			"https://www.gap.com/browse/women/gapbody?cid=1140272"
-			"#pageId=0&department=136&mlink=5643,20012060,DP_1_W_LoveByGap"
+		action="append",
+		default=None,
+		help=(
+			"Gap category URL (must include ?cid=... or pass --cid). Repeat for a multi-category run. "
+			f"Default: {DEFAULT_CATEGORY_URL}"
 		),
-		help="Gap category URL (must include ?cid=... or pass --cid)",
+	)
+	p.add_argument(
+		"--urls-file",
+		default="",
+		help="File with one category/search URL per line (blank lines and # comments ignored); adds to --url.",
 	)
 	p.add_argument(
 		"--cid",
 		default=None,
-		help="Optional category id (cid). If omitted, extracted from --url.",
+		help="Optional category id (cid). If omitted, extracted from --url. Only valid with a single URL.",
+	)
+	p.add_argument(
+		"--combined-csv",
+		action="store_true",
+		help=(
+			"Multi-category runs: write every category to --out with a Category column. "
+			"Default is one CSV per category, named from --out ({category} is substituted if present)."
+		),
+	)
+	p.add_argument(
+		"--category-concurrency",
+		type=int,
+		default=4,
+		help="Multi-category runs: category listings fetched in parallel.",
 	)
 	p.add_argument("--locale", default="en_US", help="Locale")
 	p.add_argument("--out", default="gap_women_gapbody_1140272.csv", help="Output CSV path")
@@ -826,13 +2882,35 @@ def parse_args() -> argparse.Namespace:
 	)
 	p.add_argument(
 		"--reviews",
-		choices=["powerreviews", "gap-only"],
+		choices=["powerreviews", "powerreviews-bisect", "gap-only"],
 		default="powerreviews",
 		help=(
-			"Review mode: powerreviews (slow; computes year/last-12-month counts) "
+			"Review mode: powerreviews (slow; computes year/last-12-month counts), "
+			"powerreviews-bisect (same counts, found by bisecting year boundaries with small probes "
+			"instead of paging through every review) "
 			"or gap-only (fast; uses Gap's category/search reviewCount only)."
 		),
 	)
+	p.add_argument(
+		"--years",
+		default=f"{DEFAULT_FIRST_YEAR}-",
+		help=(
+			"Calendar years that get a 'Customer Reviews YYYY Count' column: 2020-2026, 2020- "
+			"(through the current year) or a single year."
+		),
+	)
+	p.add_argument(
+		"--bucket",
+		action="append",
+		default=[],
+		metavar="SPEC",
+		help=(
+			"Extra review-count column(s), repeatable: 2024 (a year), 2025-03 (a month), months:2025 "
+			"(one column per month), last90d (rolling window) or 2024-11-01..2025-02-01 (end exclusive). "
+			"Counted from stored review timestamps; cached styles whose history does not reach back to the "
+			"earliest window are extended once. Blank in powerreviews-bisect mode, which stores no timestamps."
+		),
+	)
 	p.add_argument(
 		"--no-search-name-filter",
 		action="store_true",
@@ -846,9 +2924,64 @@ def parse_args() -> argparse.Namespace:
 		default="powerreviews_cache.json",
 		help=(
 			"Path to a JSON cache for PowerReviews counts. Helps resume long runs without losing progress. "
+			"Paths ending in .sqlite/.sqlite3/.db use a SQLite store instead (see --pr-cache-backend). "
 			"Set to empty string to disable."
 		),
 	)
+	p.add_argument(
+		"--pr-cache-backend",
+		choices=["auto", "json", "sqlite"],
+		default="auto",
+		help=(
+			"Storage for --pr-cache: json rewrites one file (throttled), sqlite upserts one row per style "
+			"and can be shared by concurrent runs. auto picks from the file extension."
+		),
+	)
+	p.add_argument(
+		"--pr-config-cache",
+		default="powerreviews_config.json",
+		help=(
+			"Path to a JSON file remembering the PowerReviews merchantId/apiKey discovered from a PDP, "
+			"so later runs skip the PDP download. Set to empty string to disable."
+		),
+	)
+	p.add_argument(
+		"--pr-config-ttl",
+		type=float,
+		default=168.0,
+		help="Hours a cached PowerReviews config stays valid before it is rediscovered.",
+	)
+	p.add_argument(
+		"--pr-max-age",
+		type=float,
+		default=0.0,
+		help="Hours after which cached PowerReviews counts are refreshed even if unchanged (0 = never expire).",
+	)
+	p.add_argument(
+		"--stale-ok",
+		action="store_true",
+		help=(
+			"Stale-while-revalidate: write the CSV straight away from cached counts (with a "
+			"'Review Counts Age (Hours)' column; styles not cached yet are blank), refresh changed or "
+			"expired styles in the background, then rewrite the CSV in place."
+		),
+	)
+	p.add_argument(
+		"--pr-refresh",
+		action="store_true",
+		help=(
+			"Refresh every cached style, even when its Gap reviewCount is unchanged: page only until the "
+			"newest review seen last time and add the new ones to the stored counts."
+		),
+	)
+	p.add_argument(
+		"--plan",
+		action="store_true",
+		help=(
+			"Dry run: fetch the Gap listings, then print the PowerReviews work plan (styles to fetch, "
+			"heaviest first, estimated requests and wall time) and exit without any PowerReviews traffic."
+		),
+	)
 	p.add_argument(
 		"--max-products",
 		type=int,
@@ -865,52 +2998,231 @@ def parse_args() -> argparse.Namespace:
 		"--gap-page-sleep",
 		type=float,
 		default=0.3,
-		help="Sleep between Gap product-list page requests (seconds)",
+		help=(
+			"Starting pace for Gap requests, as seconds between requests (0 starts at --max-rate). "
+			"The rate then adapts to the host's 429/5xx responses."
+		),
+	)
+	p.add_argument(
+		"--gap-page-concurrency",
+		type=int,
+		default=4,
+		help="Number of Gap product-list pages fetched in parallel after the first one.",
+	)
+	p.add_argument(
+		"--retries",
+		type=int,
+		default=5,
+		help=(
+			"Attempts per HTTP request (Gap and PowerReviews) on timeouts, connection errors and "
+			"429/5xx, with exponential backoff that honours Retry-After."
+		),
+	)
+	p.add_argument(
+		"--http2",
+		action="store_true",
+		help=(
+			"Use an HTTP/2 client (needs httpx[http2]) so concurrent PowerReviews requests are "
+			"multiplexed over a few connections."
+		),
 	)
 	p.add_argument(
 		"--pr-sleep",
 		type=float,
 		default=0.2,
-		help="Sleep between PowerReviews page requests (seconds)",
+		help=(
+			"Starting pace for PowerReviews requests, as seconds between requests (0 starts at "
+			"--max-rate). The rate then adapts to the host's 429/5xx responses."
+		),
+	)
+	p.add_argument(
+		"--max-rate",
+		type=float,
+		default=25.0,
+		help=(
+			"Ceiling in requests/second per host for the adaptive rate limiter, which speeds up while "
+			"a host answers normally and backs off on 429/5xx and Retry-After."
+		),
+	)
+	p.add_argument(
+		"--pr-concurrency",
+		type=int,
+		default=4,
+		help=(
+			"Number of styles whose PowerReviews pages are fetched in parallel. "
+			"All workers share one PowerReviews rate limit (see --max-rate)."
+		),
+	)
+	p.add_argument(
+		"--metrics",
+		default="",
+		metavar="PREFIX",
+		help=(
+			"At the end of the run write per-endpoint HTTP metrics (latency histogram, status codes, "
+			"retries, bytes, rate-limit and backoff sleep) to PREFIX.json and PREFIX.prom "
+			"(Prometheus text format), and print a one-line summary per endpoint."
+		),
+	)
+	p.add_argument(
+		"--metrics-port",
+		type=int,
+		default=0,
+		help="Serve the live metrics on http://127.0.0.1:PORT/metrics (and /metrics.json) during the run.",
+	)
+	p.add_argument(
+		"--pr-page-concurrency",
+		type=int,
+		default=1,
+		help=(
+			"Per-style limit on PowerReviews pages fetched in parallel once the first page reports "
+			"total_results. 1 keeps the sequential page walk."
+		),
 	)
 	return p.parse_args()
 
 
 def main() -> int:
 	args = parse_args()
-	session = _requests_session()
+	metrics_prefix = str(args.metrics).strip()
+	metrics = _HttpMetrics() if (metrics_prefix or int(args.metrics_port) > 0) else None
+	server = None
+	if metrics is not None and int(args.metrics_port) > 0:
+		server = _serve_metrics(metrics, int(args.metrics_port))
+		print(f"Serving metrics on http://127.0.0.1:{server.server_address[1]}/metrics")
+	try:
+		return _run(args, metrics=metrics)
+	finally:
+		# Written on failure too: a run that died on 429s is the one whose metrics matter most.
+		if metrics is not None and metrics_prefix:
+			json_path, prom_path = metrics.write(metrics_prefix)
+			metrics.print_summary()
+			print(f"Wrote metrics to {json_path} and {prom_path}")
+		if server is not None:
+			server.shutdown()
+
+
+def _run(args: argparse.Namespace, *, metrics: Optional[_HttpMetrics]) -> int:
+	pr_concurrency = max(1, int(args.pr_concurrency))
+	pr_page_concurrency = max(1, int(args.pr_page_concurrency))
+	gap_page_concurrency = max(1, int(args.gap_page_concurrency))
+	max_rate = max(0.2, float(args.max_rate))
+
+	def starting_rate(sleep_s: float) -> float:
+		return (1.0 / sleep_s) if sleep_s > 0 else max_rate
+
+	gap_rate = starting_rate(float(args.gap_page_sleep))
+	pr_rate = starting_rate(float(args.pr_sleep))
+	rate_limits = _HostRateLimits(
+		max_rate=max_rate,
+		host_rates={
+			str(urlparse(GAP_PRODUCTS_CC_API).hostname): gap_rate,
+			str(urlparse(GAP_BASE).hostname): gap_rate,
+			str(urlparse(POWERREVIEWS_BASE).hostname): pr_rate,
+		},
+	)
+	session = _make_session(
+		pool_size=max(pr_concurrency * pr_page_concurrency, gap_page_concurrency * max(1, int(args.category_concurrency))),
+		retry_policy=RetryPolicy(attempts=max(1, int(args.retries))),
+		rate_limits=rate_limits,
+		http2=bool(args.http2),
+		metrics=metrics,
+	)
 
-	url_params = _parse_params_from_gap_url(str(args.url))
-	# Gap search pages use browse/search.do?searchText=... but the products API expects keyword=...
-	if "searchText" in url_params and "keyword" not in url_params:
-		url_params["keyword"] = url_params["searchText"]
-		url_params.pop("searchText", None)
-
-	cid = str(args.cid) if args.cid else url_params.get("cid")
-	keyword = url_params.get("keyword")
-	if not cid and not keyword:
-		raise SystemExit(
-			"Missing cid/keyword: pass --cid, or use a category URL with ?cid=..., or a search URL like "
-			"https://www.gap.com/browse/search.do?searchText=bra. "
-			f"Got --url={args.url!s}"
+	urls = [str(u) for u in (args.url or [])]
+	if str(args.urls_file).strip():
+		urls.extend(_read_urls_file(str(args.urls_file)))
+	if not urls:
+		urls = [DEFAULT_CATEGORY_URL]
+	if args.cid and len(urls) > 1:
+		raise SystemExit("--cid can only be used with a single --url")
+
+	categories: List[Tuple[Optional[str], str]] = []
+	for url in urls:
+		url_params = _parse_params_from_gap_url(url)
+		cid = str(args.cid) if args.cid else url_params.get("cid")
+		keyword = url_params.get("keyword")
+		if not cid and not keyword:
+			raise SystemExit(
+				"Missing cid/keyword: pass --cid, or use a category URL with ?cid=..., or a search URL like "
+				"https://www.gap.com/browse/search.do?searchText=bra. "
+				f"Got --url={url!s}"
+			)
+		categories.append((cid, url))
+
+	now_utc = datetime.now(timezone.utc)
+	try:
+		years = _parse_years(str(args.years), now_utc=now_utc)
+	except ValueError as e:
+		raise SystemExit(str(e))
+	buckets: List[ReviewBucket] = []
+	for spec in args.bucket:
+		try:
+			buckets.extend(parse_bucket_spec(str(spec), now_utc=now_utc))
+		except ValueError as e:
+			raise SystemExit(str(e))
+
+	pr_max_age_s = float(args.pr_max_age) * 3600.0 if float(args.pr_max_age) > 0 else None
+	if bool(args.plan):
+		plan = plan_categories(
+			categories=categories,
+			locale=str(args.locale),
+			session=session,
+			max_products=args.max_products,
+			reviews_mode=str(args.reviews),
+			search_name_filter=(not bool(args.no_search_name_filter)),
+			pr_cache_path=(None if str(args.pr_cache).strip() == "" else str(args.pr_cache)),
+			pr_refresh=bool(args.pr_refresh),
+			pr_cache_backend=str(args.pr_cache_backend),
+			gap_page_concurrency=gap_page_concurrency,
+			category_concurrency=max(1, int(args.category_concurrency)),
+			pr_max_age_s=pr_max_age_s,
+			years=years,
+			buckets=buckets,
 		)
+		# The limiter starts at pr_rate and may speed up, so this errs on the slow side.
+		_print_plan(plan, concurrency=pr_concurrency, page_concurrency=pr_page_concurrency, rate=pr_rate)
+		return 0
+
+	stale_ok = bool(args.stale_ok)
+	output: Dict[str, Any] = dict(
+		categories=categories,
+		out_path=str(args.out),
+		combined=bool(args.combined_csv),
+		excel_hyperlinks=bool(args.excel_hyperlinks),
+		buckets=buckets,
+		with_age=stale_ok,
+		atomic=stale_ok,
+		years=years,
+	)
 
-	rows = build_rows(
-		cid=cid,
+	def write_stale(rows: List[Tuple[str, ProductRow]]) -> None:
+		_write_outputs(rows, **output)
+		print("Wrote cached counts; refreshing stale styles, the CSV will be rewritten when done")
+
+	results = build_rows_for_categories(
+		categories=categories,
 		locale=str(args.locale),
-		category_url=str(args.url),
 		session=session,
 		max_products=args.max_products,
-		gap_page_sleep_s=float(args.gap_page_sleep),
-		pr_request_sleep_s=float(args.pr_sleep),
 		granularity=str(args.granularity),
 		reviews_mode=str(args.reviews),
 		search_name_filter=(not bool(args.no_search_name_filter)),
 		pr_cache_path=(None if str(args.pr_cache).strip() == "" else str(args.pr_cache)),
 		progress_every=int(args.progress_every),
+		pr_concurrency=pr_concurrency,
+		pr_page_concurrency=pr_page_concurrency,
+		pr_refresh=bool(args.pr_refresh),
+		pr_cache_backend=str(args.pr_cache_backend),
+		gap_page_concurrency=gap_page_concurrency,
+		buckets=buckets,
+		pr_config_cache_path=(None if str(args.pr_config_cache).strip() == "" else str(args.pr_config_cache)),
+		pr_config_ttl_s=float(args.pr_config_ttl) * 3600.0,
+		category_concurrency=max(1, int(args.category_concurrency)),
+		pr_max_age_s=pr_max_age_s,
+		on_stale_rows=(write_stale if stale_ok else None),
+		years=years,
 	)
-	write_csv(rows, str(args.out), excel_hyperlinks=bool(args.excel_hyperlinks))
-	print(f"Wrote {len(rows)} rows to {args.out}")
+	_write_outputs(results, **output)
 	return 0
 
 
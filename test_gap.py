@@ -0,0 +1,21 @@
+import time
+
+import requests
+
+import gap
+
+
+def _response(status, headers):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers)
+    resp._content = b""
+    return resp
+
+
+def test_huge_retry_after_is_capped_for_the_limiter():
+    policy = gap.RetryPolicy(attempts=1, max_retry_after_s=120.0)
+    limiter = gap._AdaptiveRateLimiter(rate=10.0, max_rate=10.0)
+    resp = gap._request_with_retry(lambda: _response(429, {"Retry-After": "3600"}), policy, limiter)
+    assert resp.status_code == 429
+    assert limiter._blocked_until - time.monotonic() <= policy.max_retry_after_s